@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 import logging
 
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
 from hamcws import (
     MediaServer,
     MediaSubType as mc_MediaSubType,
@@ -27,6 +28,7 @@ from homeassistant.const import (
     CONF_PASSWORD,
     CONF_PORT,
     CONF_SSL,
+    CONF_TIMEOUT,
     CONF_USERNAME,
     EVENT_HOMEASSISTANT_STOP,
     Platform,
@@ -35,11 +37,16 @@ from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import ssl as ssl_util
 
 from .const import (
     CONF_BROWSE_PATHS,
+    CONF_CONNECT_TIMEOUT,
+    CONF_DEDICATED_SESSION,
     CONF_DEVICE_ZONES,
     CONF_EXTRA_FIELDS,
+    CONF_POLL_TIMEOUT,
+    CONF_READ_TIMEOUT,
     DATA_BROWSE_PATHS,
     DATA_COORDINATOR,
     DATA_EXTRA_FIELDS,
@@ -47,12 +54,26 @@ from .const import (
     DATA_MEDIA_SERVER,
     DATA_REMOVE_STOP_LISTENER,
     DATA_REMOVE_UPDATE_LISTENER,
+    DATA_SCHEDULER,
     DATA_SERVER_NAME,
+    DATA_SESSION,
     DATA_ZONES,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_DEDICATED_SESSION,
+    DEFAULT_POLL_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_TIMEOUT,
     DOMAIN,
+    POLL_ZONE_BUDGET,
+    SESSION_DNS_CACHE_TTL,
+    SESSION_KEEPALIVE_TIMEOUT,
+    SESSION_SPARE_CONNECTIONS,
     SERVICE_WAKE,
 )
+from .cache import create_store
 from .coordinator import MediaServerUpdateCoordinator
+from .scheduler import PollScheduler
+from .server import SingleFlightMediaServer
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS = [Platform.MEDIA_PLAYER, Platform.REMOTE, Platform.SENSOR]
@@ -62,6 +83,7 @@ PLATFORM_SCHEMA = cv.platform_only_config_schema
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the JRiver Media Center component."""
+    hass.data[DATA_SCHEDULER] = PollScheduler(hass)
 
     async def async_send_wol(call: ServiceCall) -> None:
         """Send WOL packet to each MAC address."""
@@ -108,6 +130,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
             return
 
         _LOGGER.debug("Sending WOL to %s for %s", str(mac_addresses), entity_id)
+        domain_data[DATA_COORDINATOR].async_wake_requested()
         await asyncio.gather(
             *[
                 hass.services.async_call(
@@ -129,7 +152,10 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up mcws from a config entry."""
-    ms = _get_ms(hass, entry)
+    session: ClientSession | None = None
+    if entry.options.get(CONF_DEDICATED_SESSION, DEFAULT_DEDICATED_SESSION):
+        session = _create_session(entry)
+    ms = _get_ms(hass, entry, session)
 
     extra_fields: list[str] | None = (
         entry.options[CONF_EXTRA_FIELDS]
@@ -137,11 +163,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         else entry.data[CONF_EXTRA_FIELDS]
     )
 
-    ms_coordinator = MediaServerUpdateCoordinator(hass, ms, extra_fields)
+    scheduler: PollScheduler = hass.data[DATA_SCHEDULER]
+    ms_coordinator = MediaServerUpdateCoordinator(
+        hass,
+        ms,
+        extra_fields,
+        poll_timeout=_get_poll_timeout(entry),
+        request_slots=scheduler.request_slots,
+        store=create_store(hass, entry.entry_id),
+    )
 
     async def _close(event):
         _LOGGER.debug("[%s] Closing media server connection", entry.entry_id)
         await ms.close()
+        if session:
+            await session.close()
 
     remove_stop_listener = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _close)
     remove_update_listener = entry.add_update_listener(reconfigure_entry)
@@ -170,25 +206,82 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         DATA_SERVER_NAME: entry.data[CONF_NAME],
         DATA_EXTRA_FIELDS: extra_fields,
         DATA_MAC_ADDRESSES: mac_addresses,
+        DATA_SESSION: session,
     }
 
-    await ms_coordinator.async_config_entry_first_refresh()
+    try:
+        if await ms_coordinator.async_load_cache():
+            # entities start from the cached data while the server is polled
+            entry.async_create_background_task(
+                hass, ms_coordinator.async_refresh(), f"{DOMAIN} first refresh"
+            )
+        else:
+            await ms_coordinator.async_config_entry_first_refresh()
+    except Exception:
+        # the entry is not unloaded when setup fails, e.g. before a retry
+        hass.data[DOMAIN].pop(entry.entry_id)
+        remove_stop_listener()
+        remove_update_listener()
+        await _close(None)
+        raise
+    entry.async_on_unload(scheduler.async_register(ms_coordinator))
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
 
-def _get_ms(hass: HomeAssistant, entry: ConfigEntry) -> MediaServer:
-    """Get a MediaServer instance."""
+def _get_ms(
+    hass: HomeAssistant, entry: ConfigEntry, session: ClientSession | None = None
+) -> MediaServer:
+    """Get a MediaServer instance, using the shared session if none is provided.
+
+    Identical reads made concurrently, e.g. by several entities, are only sent once.
+    """
     conn = get_mcws_connection(
         entry.data[CONF_HOST],
         entry.data[CONF_PORT],
         username=entry.data[CONF_USERNAME],
         password=entry.data[CONF_PASSWORD],
         ssl=entry.data[CONF_SSL],
-        session=async_get_clientsession(hass),
+        timeout=_get_timeouts(entry),
+        session=session or async_get_clientsession(hass),
+    )
+    return SingleFlightMediaServer(conn)
+
+
+def _create_session(entry: ConfigEntry) -> ClientSession:
+    """Create a session for the sole use of this server.
+
+    Connections are kept alive between polls, aiohttp already disables Nagle's
+    algorithm (TCP_NODELAY) on every connection.
+    """
+    connector = TCPConnector(
+        limit_per_host=max(len(entry.data[CONF_DEVICE_ZONES]), POLL_ZONE_BUDGET)
+        + SESSION_SPARE_CONNECTIONS,
+        ttl_dns_cache=SESSION_DNS_CACHE_TTL,
+        keepalive_timeout=SESSION_KEEPALIVE_TIMEOUT,
+        ssl=ssl_util.get_default_context(),
+    )
+    return ClientSession(connector=connector)
+
+
+def _get_timeouts(entry: ConfigEntry) -> ClientTimeout:
+    """Get the timeouts for each request, polls are also bounded by the poll timeout."""
+    return ClientTimeout(
+        total=entry.options.get(
+            CONF_TIMEOUT, entry.data.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
+        ),
+        sock_connect=entry.options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT),
+        sock_read=entry.options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+    )
+
+
+def _get_poll_timeout(entry: ConfigEntry) -> float:
+    """Get the time allowed for each poll, at most the total timeout of a request."""
+    return min(
+        entry.options.get(CONF_POLL_TIMEOUT, DEFAULT_POLL_TIMEOUT),
+        _get_timeouts(entry).total,
     )
-    return MediaServer(conn)
 
 
 async def reconfigure_entry(hass: HomeAssistant, entry: ConfigEntry):
@@ -242,12 +335,19 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok and DOMAIN in hass.data:
         data = hass.data[DOMAIN].pop(entry.entry_id)
         await data[DATA_MEDIA_SERVER].close()
+        if data[DATA_SESSION]:
+            await data[DATA_SESSION].close()
         data[DATA_REMOVE_STOP_LISTENER]()
         data[DATA_REMOVE_UPDATE_LISTENER]()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached data for the config entry."""
+    await create_store(hass, entry.entry_id).async_remove()
+
+
 def _translate_to_media_class(
     media_type: mc_MediaType | str | None,
     media_sub_type: mc_MediaSubType | str | None,
@@ -0,0 +1,114 @@
+"""Caches the MediaServer browse tree so revisiting a node does not query it again."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import logging
+import sys
+import time
+from typing import Any, TypeVar
+
+from .const import BROWSE_CACHE_MAX_BYTES, BROWSE_CACHE_MAX_ENTRIES, BROWSE_CACHE_TTL
+
+_T = TypeVar("_T")
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _approx_size(value: Any) -> int:
+    """Estimate the bytes held by a decoded MCWS response."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_approx_size(k) + _approx_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_approx_size(v) for v in value)
+    return size
+
+
+@dataclass(slots=True)
+class _Entry:
+    """A cached value and when it expires."""
+
+    value: Any
+    size: int
+    expires_at: float
+
+
+class BrowseCache:
+    """A TTL and LRU cache of browse results keyed by node id.
+
+    Entries expire after ttl seconds, the least recently used entries are evicted
+    once there are more than max_entries or they hold more than roughly max_bytes.
+    Cached values are shared so must be treated as read only.
+    """
+
+    def __init__(
+        self,
+        ttl: float = BROWSE_CACHE_TTL,
+        max_entries: int = BROWSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = BROWSE_CACHE_MAX_BYTES,
+    ) -> None:
+        """Initialize."""
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[Any, _Entry] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        """Get the number of cached entries, including any which have expired."""
+        return len(self._entries)
+
+    def get(self, key: Any) -> Any | None:
+        """Get the cached value, None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def put(self, key: Any, value: Any) -> None:
+        """Cache the value, evicting the least recently used values if necessary."""
+        if key in self._entries:
+            self._remove(key)
+        size = _approx_size(value)
+        if size > self._max_bytes:
+            return
+        self._entries[key] = _Entry(value, size, time.monotonic() + self._ttl)
+        self._bytes += size
+        while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    async def async_get_or_fetch(
+        self, key: Any, fetch: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Get the cached value or fetch and cache it."""
+        value = self.get(key)
+        if value is None:
+            value = await fetch()
+            self.put(key, value)
+        return value
+
+    def discard(self, key: Any) -> None:
+        """Remove the value if it is cached."""
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        if self._entries:
+            _LOGGER.debug(
+                "Clearing %d browse entries (~%d bytes)",
+                len(self._entries),
+                self._bytes,
+            )
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: Any) -> None:
+        self._bytes -= self._entries.pop(key).size
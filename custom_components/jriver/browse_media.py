@@ -1,14 +1,20 @@
 """Support for media browsing."""
 
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Sequence
 import contextlib
+from dataclasses import dataclass, field
+from itertools import islice
 import logging
+from typing import TypeVar
+import unicodedata
 
 from hamcws import (
     BrowsePath,
     MediaServer,
     MediaSubType,
     MediaType as mc_MediaType,
-    search_for_path,
 )
 
 from homeassistant.components import media_source
@@ -21,7 +27,15 @@ from homeassistant.components.media_player import (
 from homeassistant.core import HomeAssistant
 
 from . import _translate_to_media_class, _translate_to_media_type
-from .const import MC_FIELD_TO_HA_MEDIACLASS, MC_FIELD_TO_HA_MEDIATYPE
+from .browse_cache import BrowseCache
+from .const import (
+    BROWSE_BUCKET_THRESHOLD,
+    BROWSE_PAGE_SIZE,
+    MC_FIELD_TO_HA_MEDIACLASS,
+    MC_FIELD_TO_HA_MEDIATYPE,
+)
+
+_T = TypeVar("_T")
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +44,70 @@ class UnknownMediaType(BrowseError):
     """Unknown media type."""
 
 
+@dataclass(slots=True)
+class _IndexNode:
+    """A non field BrowsePath and the paths below it."""
+
+    path: BrowsePath
+    children: dict[str, _IndexNode] = field(default_factory=dict)
+    # the levels below the path if they are all fields, i.e. match any node name
+    fields: list[BrowsePath] = field(default_factory=list)
+
+
+class BrowsePathIndex:
+    """A trie of the browse paths keyed by node name.
+
+    Finds the same BrowsePath as hamcws search_for_path in one step per level and
+    remembers how each BrowsePath is classified.
+    """
+
+    def __init__(self, paths: list[BrowsePath]) -> None:
+        """Index the paths."""
+        self.paths = paths
+        self._root = self._index(paths)
+        self._classifications: dict[int, tuple[MediaClass, MediaType] | None] = {}
+
+    @classmethod
+    def _index(cls, paths: list[BrowsePath]) -> dict[str, _IndexNode]:
+        nodes: dict[str, _IndexNode] = {}
+        for path in paths:
+            # the first path with a name wins, as in search_for_path
+            if path.is_field or path.name in nodes:
+                continue
+            node = _IndexNode(path)
+            descendents = path.descendents
+            if descendents and all(d.is_field for d in descendents):
+                node.fields = descendents
+            else:
+                node.children = cls._index(path.children)
+            nodes[path.name] = node
+        return nodes
+
+    def find(self, tokens: Sequence[str]) -> BrowsePath | None:
+        """Find the BrowsePath for the node names from the root."""
+        level = self._root
+        for depth, token in enumerate(tokens, start=1):
+            node = level.get(token)
+            if node is None:
+                return None
+            remaining = len(tokens) - depth
+            if not remaining:
+                return node.path
+            if node.fields:
+                if remaining > len(node.fields):
+                    return None
+                return node.fields[remaining - 1]
+            level = node.children
+        return None
+
+    def classify(self, path: BrowsePath) -> tuple[MediaClass, MediaType] | None:
+        """Get the media class and type of nodes at the path."""
+        key = id(path)
+        if key not in self._classifications:
+            self._classifications[key] = _classify_browse_path(path)
+        return self._classifications[key]
+
+
 def media_source_content_filter(item: BrowseMedia) -> bool:
     """Content filter for media sources."""
     # MK media-source
@@ -64,17 +142,59 @@ def _decode_media_class(item: dict) -> MediaClass | str:
     )
 
 
+async def _cached(
+    cache: BrowseCache | None, key: tuple[str, int], fetch: Callable[[], Awaitable[_T]]
+) -> _T:
+    if cache is None:
+        return await fetch()
+    return await cache.async_get_or_fetch(key, fetch)
+
+
+def _bucket_label(name: str) -> str:
+    """Get the label of the bucket for the name, 0-9, A-Z or #."""
+    initial = unicodedata.normalize("NFKD", name.lstrip()[:1])[:1].upper()
+    if initial.isdigit():
+        return "0-9"
+    if "A" <= initial <= "Z":
+        return initial
+    return "#"
+
+
+def _bucket_order(label: str) -> tuple[int, str]:
+    return (0 if label == "0-9" else 2 if label == "#" else 1), label
+
+
+def _group_by_initial(nodes: dict[str, str]) -> dict[str, dict[str, str]]:
+    """Group the nodes into buckets by the initial of their name."""
+    buckets: dict[str, dict[str, str]] = {}
+    for name, node_id in nodes.items():
+        buckets.setdefault(_bucket_label(name), {})[name] = node_id
+    return {label: buckets[label] for label in sorted(buckets, key=_bucket_order)}
+
+
 async def browse_nodes(
     hass: HomeAssistant,
     ms: MediaServer,
-    browse_paths: list[BrowsePath],
+    browse_paths: BrowsePathIndex,
     parent_content_type: str | None = None,
     parent_id: str = "-1",
+    cache: BrowseCache | None = None,
+    bucket_threshold: int | None = BROWSE_BUCKET_THRESHOLD,
 ) -> tuple[BrowseMedia, int]:
-    """Create a BrowseMedia containing the children of the specified base_id."""
+    """Create a BrowseMedia containing the children of the specified base_id.
+
+    The children and files of each node are read from the cache if given. Nodes
+    with more than BROWSE_PAGE_SIZE children are returned a page at a time, each
+    page ends with a node for the next page with an id of P|offset|node id|path.
+
+    The children of nodes with more than bucket_threshold children are grouped by
+    initial, each group is a node with an id of B|label|offset|node id|path.
+    """
     if not parent_id:
         parent_id = "-1"
     parent_media_id = parent_id
+    offset = 0
+    bucket: str | None = None
     mt: MediaType | str | None
     mc: MediaClass | str | None
     container_media_class: MediaClass = MediaClass.DIRECTORY
@@ -83,14 +203,21 @@ async def browse_nodes(
     if parent_id == "-1":
         parent_name = None
         path_tokens = []
-    elif parent_id.startswith("N|"):
-        _, parent_id, parent_name = parent_id.split("|", 3)
+    elif parent_id.startswith(("N|", "P|", "B|")):
+        if parent_id.startswith("P|"):
+            _, page_offset, parent_id, parent_name = parent_id.split("|", 3)
+            offset = int(page_offset)
+        elif parent_id.startswith("B|"):
+            _, bucket, page_offset, parent_id, parent_name = parent_id.split("|", 4)
+            offset = int(page_offset)
+        else:
+            _, parent_id, parent_name = parent_id.split("|", 3)
         path_tokens = parent_name.split(" > ")
         if parent_content_type:
             container_media_type = parent_content_type
-        browse_path = search_for_path(browse_paths, path_tokens)
+        browse_path = browse_paths.find(path_tokens)
         if browse_path:
-            classification = _classify_browse_path(browse_path)
+            classification = browse_paths.classify(browse_path)
             if classification:
                 container_media_class = classification[0]
                 container_media_type = str(classification[1])
@@ -101,22 +228,61 @@ async def browse_nodes(
         raise ValueError(f"Unknown media_content_id format {parent_id}")
 
     is_child: bool = parent_name is not None
+    # only children of the library are paged, the root is small
+    page_size = BROWSE_PAGE_SIZE if is_child else None
+    page_end = offset + page_size if page_size else None
+
+    base_id = int(parent_id)
 
-    nodes = await ms.browse_children(base_id=int(parent_id))
+    async def _browse_children() -> dict[str, str]:
+        children = await ms.browse_children(base_id=base_id)
+        if cache is not None:
+            # any buckets were grouped from the children this replaces
+            cache.discard(("buckets", base_id))
+        return children
+
+    nodes = await _cached(cache, ("children", base_id), _browse_children)
     items: list[dict[str, str]]
     expandable: bool
+    if bucket is not None or (
+        nodes
+        and is_child
+        and bucket_threshold
+        and not offset
+        and len(nodes) > bucket_threshold
+    ):
+
+        async def _group() -> dict[str, dict[str, str]]:
+            return _group_by_initial(nodes)
+
+        buckets = await _cached(cache, ("buckets", base_id), _group)
+        if bucket is None:
+            return _browse_buckets(
+                buckets,
+                base_id,
+                parent_name,
+                parent_media_id,
+                container_media_class,
+                container_media_type,
+            )
+        if bucket not in buckets:
+            # the children changed since the bucket was listed
+            raise BrowseError(f"Media not found: {parent_media_id}")
+        nodes = buckets[bucket]
+
     if nodes:
+        total = len(nodes)
         items = []
-        for name, node_id in nodes.items():
+        for name, node_id in islice(nodes.items(), offset, page_end):
             child_path = [*path_tokens, name]
             if container_media_class == MediaClass.PLAYLIST:
                 mt = container_media_type
                 mc = container_media_class
             else:
-                browse_path = search_for_path(browse_paths, child_path)
+                browse_path = browse_paths.find(child_path)
                 if not browse_path:
                     continue
-                classification = _classify_browse_path(browse_path)
+                classification = browse_paths.classify(browse_path)
                 if classification:
                     mc, mt = classification
                 else:
@@ -129,6 +295,7 @@ async def browse_nodes(
                 "id": node_id,
                 "media_id": f"N|{node_id}|{' > '.join(child_path)}",
                 "name": name,
+                # only fetches the token the first time, the rest do no I/O
                 "thumbnail": await ms.get_browse_thumbnail_url(node_id),
                 "mt": mt,
                 "mc": mc,
@@ -136,7 +303,11 @@ async def browse_nodes(
             items.append(vals)
         expandable = len(items) > 0
     else:
-        files = await ms.browse_files(base_id=int(parent_id))
+        files = await _cached(
+            cache, ("files", base_id), lambda: ms.browse_files(base_id=base_id)
+        )
+        total = len(files)
+        files = files[offset:page_end]
         items = [
             {
                 "id": file["Key"],
@@ -163,12 +334,33 @@ async def browse_nodes(
         for item in items
     ]
     count = len(children)
+    if page_size and page_end < total:
+        children.append(
+            BrowseMedia(
+                title=f"More ({page_end + 1}-{min(page_end + page_size, total)}"
+                f" of {total})",
+                media_class=MediaClass.DIRECTORY,
+                media_content_type=container_media_type,
+                media_content_id=(
+                    f"B|{bucket}|{page_end}|{base_id}|{parent_name}"
+                    if bucket is not None
+                    else f"P|{page_end}|{base_id}|{parent_name}"
+                ),
+                can_play=False,
+                can_expand=True,
+            )
+        )
     library_info = BrowseMedia(
         media_class=container_media_class,
         media_content_id=parent_media_id,
         media_content_type=container_media_type,
-        title=parent_name if parent_name else "Media Library",
-        can_play=not expandable,
+        title=(
+            f"{parent_name} ({bucket})"
+            if bucket is not None
+            else parent_name or "Media Library"
+        ),
+        # a page or bucket cannot be played on its own
+        can_play=not expandable and not offset and bucket is None,
         can_expand=expandable,
         children=children,
     )
@@ -188,6 +380,38 @@ async def browse_nodes(
     return library_info, count
 
 
+def _browse_buckets(
+    buckets: dict[str, dict[str, str]],
+    base_id: int,
+    parent_name: str,
+    parent_media_id: str,
+    container_media_class: MediaClass,
+    container_media_type: MediaType | str,
+) -> tuple[BrowseMedia, int]:
+    """Create a BrowseMedia containing a node for each bucket."""
+    children = [
+        BrowseMedia(
+            title=f"{label} ({len(nodes)})",
+            media_class=MediaClass.DIRECTORY,
+            media_content_type=container_media_type,
+            media_content_id=f"B|{label}|0|{base_id}|{parent_name}",
+            can_play=False,
+            can_expand=True,
+        )
+        for label, nodes in buckets.items()
+    ]
+    library_info = BrowseMedia(
+        media_class=container_media_class,
+        media_content_id=parent_media_id,
+        media_content_type=container_media_type,
+        title=parent_name,
+        can_play=False,
+        can_expand=True,
+        children=children,
+    )
+    return library_info, len(children)
+
+
 def _classify_browse_path(path: BrowsePath) -> tuple[MediaClass, MediaType] | None:
     def _translate(
         mc_mt: mc_MediaType, mc_mst: MediaSubType | None
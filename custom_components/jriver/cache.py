@@ -0,0 +1,133 @@
+"""Persists the slow changing MediaServer data to start quickly after a restart."""
+
+from __future__ import annotations
+
+import datetime as dt
+from typing import Any, NamedTuple
+
+from hamcws import (
+    BrowsePath,
+    MediaServerInfo,
+    MediaSubType,
+    MediaType as mc_MediaType,
+    ViewMode,
+    Zone,
+)
+
+from homeassistant.components.media_player import MediaType
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+
+
+def create_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Create the store for the config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+class CachedServer(NamedTuple):
+    """The MediaServer data that is kept between restarts."""
+
+    server_info: MediaServerInfo
+    zones: list[Zone]
+    view_mode: ViewMode
+    browse_paths: list[BrowsePath] | None
+    last_path_refresh: dt.datetime | None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Convert to a JSON serialisable dict."""
+        return {
+            "server_info": {
+                "ProgramVersion": self.server_info.version,
+                "FriendlyName": self.server_info.name,
+                "Platform": self.server_info.platform,
+            },
+            "zones": [
+                {
+                    "index": z.index,
+                    "id": z.id,
+                    "name": z.name,
+                    "guid": z.guid,
+                    "is_dlna": z.is_dlna,
+                    "active": z.active,
+                }
+                for z in self.zones
+            ],
+            "view_mode": self.view_mode.value,
+            # the paths are only valid for the server version they were loaded from
+            "browse_paths": None
+            if self.browse_paths is None
+            else {
+                "version": self.server_info.version,
+                "refreshed_at": self.last_path_refresh.isoformat()
+                if self.last_path_refresh
+                else None,
+                "paths": [_dump_path(p) for p in self.browse_paths],
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CachedServer:
+        """Convert from the dict created by as_dict."""
+        server_info = MediaServerInfo(data["server_info"])
+        browse_paths: list[BrowsePath] | None = None
+        last_path_refresh: dt.datetime | None = None
+        if (paths := data["browse_paths"]) and paths["version"] == server_info.version:
+            browse_paths = [_load_path(p, None) for p in paths["paths"]]
+            if paths["refreshed_at"]:
+                last_path_refresh = dt_util.parse_datetime(paths["refreshed_at"])
+        return cls(
+            server_info=server_info,
+            zones=[_load_zone(z) for z in data["zones"]],
+            view_mode=ViewMode(data["view_mode"]),
+            browse_paths=browse_paths,
+            last_path_refresh=last_path_refresh,
+        )
+
+
+def _load_zone(data: dict[str, Any]) -> Zone:
+    i = data["index"]
+    return Zone(
+        {
+            f"ZoneID{i}": data["id"],
+            f"ZoneName{i}": data["name"],
+            f"ZoneGUID{i}": data["guid"],
+            f"ZoneDLNA{i}": "1" if data["is_dlna"] else "0",
+        },
+        i,
+        data["id"] if data["active"] else None,
+    )
+
+
+def _dump_path(path: BrowsePath) -> dict[str, Any]:
+    return {
+        "name": path.name,
+        "is_field": path.is_field,
+        "media_types": [str(t) for t in path.media_types],
+        "media_sub_types": [str(t) for t in path.media_sub_types],
+        "children": [_dump_path(c) for c in path.children],
+    }
+
+
+def _load_media_type(value: str) -> mc_MediaType | MediaType:
+    """Load a media type, paths may hold MC or HA (e.g. for playlists) types."""
+    try:
+        return mc_MediaType(value)
+    except ValueError:
+        return MediaType(value)
+
+
+def _load_path(data: dict[str, Any], parent: BrowsePath | None) -> BrowsePath:
+    path = BrowsePath(
+        data["name"],
+        is_field=data["is_field"],
+        parent=parent,
+        media_types=[_load_media_type(t) for t in data["media_types"]],
+        media_sub_types=[MediaSubType(t) for t in data["media_sub_types"]],
+    )
+    path.children = [_load_path(c, path) for c in data["children"]]
+    return path
@@ -0,0 +1,42 @@
+"""The features supported by a MediaServer, derived from its version."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+from awesomeversion import AwesomeVersion
+from hamcws import MediaServerInfo
+
+# the first versions supporting each feature
+_MIN_VERSION_BROWSE_RULES = "32.0.6"
+
+
+@dataclass(frozen=True, slots=True)
+class ServerCapabilities:
+    """The features supported by a version of the server."""
+
+    version: str
+    # browse paths can be read from the server (Browse/Rules)
+    can_refresh_paths: bool = False
+
+
+UNKNOWN_CAPABILITIES = ServerCapabilities("Unknown")
+
+
+@lru_cache(maxsize=8)
+def _capabilities_for_version(version: str) -> ServerCapabilities:
+    parsed = AwesomeVersion(version)
+    if not parsed.valid:
+        return ServerCapabilities(version)
+    return ServerCapabilities(
+        version,
+        can_refresh_paths=parsed >= _MIN_VERSION_BROWSE_RULES,
+    )
+
+
+def get_capabilities(server_info: MediaServerInfo | None) -> ServerCapabilities:
+    """Get the capabilities of the server, each version is only parsed once."""
+    if server_info is None:
+        return UNKNOWN_CAPABILITIES
+    return _capabilities_for_version(server_info.version)
@@ -35,6 +35,9 @@ from homeassistant.core import callback
 from homeassistant.data_entry_flow import AbortFlow, FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import (
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
     SelectSelector,
     SelectSelectorConfig,
     TextSelector,
@@ -42,19 +45,27 @@ from homeassistant.helpers.selector import (
     TextSelectorType,
 )
 
+from .capabilities import get_capabilities
 from .const import (
     CONF_BROWSE_PATHS,
+    CONF_CONNECT_TIMEOUT,
+    CONF_DEDICATED_SESSION,
     CONF_DEVICE_PER_ZONE,
     CONF_DEVICE_ZONES,
     CONF_EXTRA_FIELDS,
+    CONF_POLL_TIMEOUT,
+    CONF_READ_TIMEOUT,
     CONF_USE_WOL,
     DEFAULT_BROWSE_PATHS,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_DEDICATED_SESSION,
     DEFAULT_DEVICE_PER_ZONE,
     DEFAULT_PORT,
+    DEFAULT_POLL_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
     DEFAULT_SSL,
     DEFAULT_TIMEOUT,
     DOMAIN,
-    _can_refresh_paths,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -218,7 +229,7 @@ class JRiverConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return await self.async_step_zones()
             return await self.async_step_select_playback_fields()
 
-        if _can_refresh_paths(self._ms):
+        if get_capabilities(self._ms.media_server_info).can_refresh_paths:
             return await _next_form()
 
         if not self._browse_paths:
@@ -471,6 +482,21 @@ class JRiverOptionsFlowHandler(config_entries.OptionsFlow):
         self._extra_fields: list[str] = self._get_existing(CONF_EXTRA_FIELDS, [])
         self._mac_addresses: list[str] = self._get_existing(CONF_MAC, [])
         self._use_wol: bool = self._get_existing(CONF_USE_WOL, True)
+        self._timeouts: dict[str, float] = {
+            CONF_CONNECT_TIMEOUT: self._get_existing(
+                CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT
+            ),
+            CONF_READ_TIMEOUT: self._get_existing(
+                CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT
+            ),
+            CONF_TIMEOUT: self._get_existing(CONF_TIMEOUT, DEFAULT_TIMEOUT),
+            CONF_POLL_TIMEOUT: self._get_existing(
+                CONF_POLL_TIMEOUT, DEFAULT_POLL_TIMEOUT
+            ),
+        }
+        self._dedicated_session: bool = self._get_existing(
+            CONF_DEDICATED_SESSION, DEFAULT_DEDICATED_SESSION
+        )
         self._ms: MediaServer | str | None = None
 
     async def async_step_init(
@@ -485,7 +511,10 @@ class JRiverOptionsFlowHandler(config_entries.OptionsFlow):
                 errors["base"] = self._ms
                 self._ms = None
 
-        if self._ms and _can_refresh_paths(self._ms):
+        if (
+            self._ms
+            and get_capabilities(self._ms.media_server_info).can_refresh_paths
+        ):
             return await self.async_step_macs()
 
         if not errors and user_input is not None:
@@ -524,7 +553,7 @@ class JRiverOptionsFlowHandler(config_entries.OptionsFlow):
         """Manage the extra fields."""
         if user_input is not None:
             self._extra_fields = user_input.get(CONF_EXTRA_FIELDS, [])
-            return self.async_create_entry(title="", data=self._get_data())
+            return await self.async_step_connection()
 
         await self._ensure_library_fields()
 
@@ -541,6 +570,44 @@ class JRiverOptionsFlowHandler(config_entries.OptionsFlow):
 
         return self.async_show_form(step_id="fields", data_schema=schema, errors={})
 
+    async def async_step_connection(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the request timeouts and connection pool."""
+        errors = {}
+        if user_input is not None:
+            self._timeouts = {k: user_input[k] for k in self._timeouts}
+            self._dedicated_session = user_input[CONF_DEDICATED_SESSION]
+            if self._timeouts[CONF_POLL_TIMEOUT] >= self._timeouts[CONF_TIMEOUT]:
+                errors["base"] = "poll_timeout_too_long"
+            else:
+                return self.async_create_entry(title="", data=self._get_data())
+
+        seconds = NumberSelector(
+            NumberSelectorConfig(
+                min=1,
+                max=60,
+                step=0.5,
+                unit_of_measurement="s",
+                mode=NumberSelectorMode.BOX,
+            )
+        )
+        schema = vol.Schema(
+            {
+                **{
+                    vol.Required(k, default=v): seconds
+                    for k, v in self._timeouts.items()
+                },
+                vol.Required(
+                    CONF_DEDICATED_SESSION, default=self._dedicated_session
+                ): bool,
+            }
+        )
+
+        return self.async_show_form(
+            step_id="connection", data_schema=schema, errors=errors
+        )
+
     async def async_step_macs(self, user_input=None):
         """Handle mac address input."""
         schema = vol.Schema(
@@ -585,6 +652,8 @@ class JRiverOptionsFlowHandler(config_entries.OptionsFlow):
             CONF_EXTRA_FIELDS: self._extra_fields,
             CONF_MAC: self._mac_addresses,
             CONF_USE_WOL: self._use_wol,
+            **self._timeouts,
+            CONF_DEDICATED_SESSION: self._dedicated_session,
         }
 
         return data
@@ -1,19 +1,71 @@
 """Constants for the JRiver Media Center integration."""
 from __future__ import annotations
 
-from awesomeversion import AwesomeVersion
-from hamcws import MediaServer
-
 CONF_BROWSE_PATHS = "browse_paths"
 CONF_DEVICE_PER_ZONE = "per_zone"
 CONF_DEVICE_ZONES = "device_zones"
 CONF_EXTRA_FIELDS = "extra_fields"
 CONF_USE_WOL = "use_wol"
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_READ_TIMEOUT = "read_timeout"
+CONF_POLL_TIMEOUT = "poll_timeout"
+CONF_DEDICATED_SESSION = "dedicated_session"
 
 DOMAIN = "jriver"
 DEFAULT_PORT = 52199
 DEFAULT_SSL = False
 DEFAULT_TIMEOUT = 5
+DEFAULT_CONNECT_TIMEOUT = 3
+DEFAULT_READ_TIMEOUT = 5
+# a status update has to complete within this time, less than the total timeout
+# allowed for any single request, e.g. browsing or a command
+DEFAULT_POLL_TIMEOUT = 2
+DEFAULT_DEDICATED_SESSION = False
+# tuning for a session dedicated to a server, connections are kept open between
+# polls and allowed for each zone plus a few more for commands
+SESSION_KEEPALIVE_TIMEOUT = 10
+SESSION_DNS_CACHE_TTL = 300
+SESSION_SPARE_CONNECTIONS = 2
+# share of the time left in a poll given to the playback info fetch, the rest is
+# kept for any follow up calls
+POLL_DEADLINE_ZONE_SHARE = 0.75
+# poll every second while something is playing, backing off through the idle
+# intervals (in seconds) after IDLE_POLLS_PER_STEP consecutive idle polls
+POLL_INTERVAL_ACTIVE = 1
+POLL_INTERVALS_IDLE = (1, 2, 5, 10, 30)
+IDLE_POLLS_PER_STEP = 10
+# resync the extrapolated playback position if it drifts by more than this
+POSITION_DRIFT_TOLERANCE_MS = 2000
+# max zones to poll each time, the active and playing zones are always polled
+POLL_ZONE_BUDGET = 4
+# max requests in flight at once across the polls of every server
+MAX_CONCURRENT_REQUESTS = 8
+# seconds to wait for further commands before refreshing after a command
+REFRESH_COMMAND_COOLDOWN = 0.5
+# seconds between refreshes of data that changes less often than playback info
+REFRESH_INTERVAL_VIEW_MODE = 5
+REFRESH_INTERVAL_SERVER = 300
+# browse paths are reloaded in the background, retrying a failed reload sooner
+REFRESH_INTERVAL_PATHS = 900
+RETRY_INTERVAL_PATHS = 60
+# browse results are cached for BROWSE_CACHE_TTL seconds, bounded by the number of
+# nodes and their approximate size in bytes
+BROWSE_CACHE_TTL = 300
+BROWSE_CACHE_MAX_ENTRIES = 500
+BROWSE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+# max children returned by one browse, larger nodes are split into pages
+BROWSE_PAGE_SIZE = 250
+# nodes with more children than this are grouped by initial (0-9, A-Z, #)
+BROWSE_BUCKET_THRESHOLD = 500
+# seconds to wait before polling a zone again after consecutive failures
+ZONE_RETRY_INTERVALS = (1, 5, 15, 30, 60)
+# seconds to wait before saving changes to the data cached between restarts
+CACHE_SAVE_DELAY = 30
+# stop polling after this many consecutive failures to connect, only checking if
+# the server is alive at an interval doubling from the min to the max (in seconds)
+OFFLINE_AFTER_FAILURES = 3
+OFFLINE_PROBE_INTERVAL_MIN = 5
+OFFLINE_PROBE_INTERVAL_MAX = 300
 DEFAULT_DEVICE_PER_ZONE = False
 DEFAULT_BROWSE_PATHS = [
     "Audio,Artist|Album Artist (auto),Album",
@@ -35,6 +87,9 @@ DATA_COORDINATOR = "coordinator"
 DATA_ZONES = "zones"
 DATA_SERVER_NAME = "server_name"
 DATA_MAC_ADDRESSES = "mac_addresses"
+DATA_SESSION = "session"
+# hass.data key for the PollScheduler shared by all entries, outside of DOMAIN
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
 
 MC_FIELD_TO_HA_MEDIATYPE: dict[str, str] = {
     "Audio": "MUSIC",
@@ -56,9 +111,3 @@ MC_FIELD_TO_HA_MEDIACLASS: dict[str, str] = {
 }
 
 SERVICE_WAKE = "wake"
-
-
-def _can_refresh_paths(ms: MediaServer) -> bool:
-    """Show if the server version supports reload."""
-    v = ms.media_server_info.version if ms.media_server_info else None
-    return v and v != "Unknown" and AwesomeVersion(v) >= "32.0.6"
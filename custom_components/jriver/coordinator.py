@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass, field
+from collections.abc import Awaitable, Callable, Collection
+import copy
+from dataclasses import InitVar, dataclass, field, replace
 import datetime as dt
+from functools import partial
 import logging
-from typing import TypeVar
+from typing import Any, NamedTuple, TypeVar
 
 from hamcws import (
     BrowsePath,
@@ -17,64 +20,247 @@ from hamcws import (
     MediaServerError,
     MediaServerInfo,
     PlaybackInfo,
+    PlaybackState,
     ViewMode,
     Zone,
     convert_browse_rules,
 )
 
 from homeassistant.components.media_player import MediaType
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, _can_refresh_paths
+from .browse_cache import BrowseCache
+from .cache import CachedServer
+from .capabilities import UNKNOWN_CAPABILITIES, ServerCapabilities, get_capabilities
+from .const import (
+    CACHE_SAVE_DELAY,
+    DEFAULT_POLL_TIMEOUT,
+    DOMAIN,
+    IDLE_POLLS_PER_STEP,
+    OFFLINE_AFTER_FAILURES,
+    OFFLINE_PROBE_INTERVAL_MAX,
+    OFFLINE_PROBE_INTERVAL_MIN,
+    POLL_INTERVAL_ACTIVE,
+    POLL_DEADLINE_ZONE_SHARE,
+    POLL_INTERVALS_IDLE,
+    POLL_ZONE_BUDGET,
+    POSITION_DRIFT_TOLERANCE_MS,
+    REFRESH_COMMAND_COOLDOWN,
+    REFRESH_INTERVAL_PATHS,
+    REFRESH_INTERVAL_SERVER,
+    REFRESH_INTERVAL_VIEW_MODE,
+    RETRY_INTERVAL_PATHS,
+    ZONE_RETRY_INTERVALS,
+)
 
 V = TypeVar("V")
 
 
 _LOGGER = logging.getLogger(__name__)
 
+# listener contexts, entities subscribe to a set of these and are only updated when
+# one of them changes
+CONTEXT_ACTIVE_ZONE = "active_zone"
+CONTEXT_VIEW_MODE = "view_mode"
+CONTEXT_BROWSE_PATHS = "browse_paths"
+
+
+class ZoneContext(NamedTuple):
+    """Context for playback in the named zone."""
+
+    zone_name: str | None
+
+
+def zone_context(zone_name: str | None) -> ZoneContext:
+    """Get the context for playback in the named zone, None means the active zone."""
+    return ZoneContext(zone_name)
+
+
+def playback_info_changed(
+    old: PlaybackInfo | None, new: PlaybackInfo | None, ignore_position: bool = False
+) -> bool:
+    """Compare the values held by the PlaybackInfo as it does not implement __eq__."""
+    if old is new:
+        return False
+    if old is None or new is None:
+        return True
+    if ignore_position:
+        return {**vars(old), "position_ms": None} != {**vars(new), "position_ms": None}
+    return vars(old) != vars(new)
+
+
+def _same_zones(old: list[Zone], new: list[Zone]) -> bool:
+    """Compare the zones as Zone does not implement __eq__."""
+    return len(old) == len(new) and all(
+        (o.id, o.name, o.active) == (n.id, n.name, n.active)
+        for o, n in zip(old, new)
+    )
+
+
+def _reuse(old: dict[str, V], new: dict[str, V]) -> dict[str, V]:
+    """Get the old dict if the new one holds the same objects."""
+    if old.keys() == new.keys() and all(old[k] is v for k, v in new.items()):
+        return old
+    return new
+
+
+@dataclass(frozen=True, slots=True)
+class PlaybackPosition:
+    """The playback position at a point in time, moves with time while playing."""
+
+    position_ms: int
+    updated_at: dt.datetime
+    playing: bool
+
+    def predict(self, at: dt.datetime) -> int:
+        """Get the expected position at the given time."""
+        if not self.playing:
+            return self.position_ms
+        return self.position_ms + round((at - self.updated_at).total_seconds() * 1000)
+
+    def sync(self, info: PlaybackInfo, at: dt.datetime) -> PlaybackPosition:
+        """Get the position after observing the given PlaybackInfo.
+
+        The position is only moved if the observed position drifts too far from the
+        expected position, e.g. after a seek or if playback stalls.
+        """
+        playing = info.state == PlaybackState.PLAYING
+        if (
+            playing == self.playing
+            and abs(info.position_ms - self.predict(at)) <= POSITION_DRIFT_TOLERANCE_MS
+        ):
+            return self
+        return PlaybackPosition(info.position_ms, at, playing)
+
+
+@dataclass(frozen=True, slots=True)
+class ZoneBackoff:
+    """The retry state of a zone whose playback info could not be fetched."""
+
+    failures: int
+    retry_at: dt.datetime
 
-@dataclass(frozen=True, kw_only=True)
+    def next(self, now: dt.datetime) -> ZoneBackoff:
+        """Get the retry state after another failure."""
+        failures = self.failures + 1
+        delay = ZONE_RETRY_INTERVALS[min(failures, len(ZONE_RETRY_INTERVALS)) - 1]
+        return ZoneBackoff(failures, now + dt.timedelta(seconds=delay))
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
 class MediaServerData:
-    """MediaServer data."""
+    """An immutable snapshot of the MediaServer data.
+
+    Values which have not changed since the previous snapshot are the same
+    objects, the active zone is found when it is created unless the zones are
+    those of the previous snapshot.
+    """
 
     server_info: MediaServerInfo | None = None
+    capabilities: ServerCapabilities = UNKNOWN_CAPABILITIES
     playback_info_by_zone: dict[str, PlaybackInfo] = field(default_factory=dict)
-    position_updated_at_by_zone: dict[str, dt.datetime] = field(default_factory=dict)
+    position_by_zone: dict[str, PlaybackPosition] = field(default_factory=dict)
+    playback_info_updated_at_by_zone: dict[str, dt.datetime] = field(
+        default_factory=dict
+    )
     zones: list[Zone] = field(default_factory=list)
     view_mode: ViewMode = ViewMode.UNKNOWN
     browse_paths: list[BrowsePath] | None = None
     last_path_refresh: dt.datetime | None = None
+    stale_zones: frozenset[str] = frozenset()
+    active_zone: Zone | None = field(init=False)
+    _default_zone_name: str | None = field(init=False, repr=False)
+    previous: InitVar[MediaServerData | None] = None
+
+    def __post_init__(self, previous: MediaServerData | None) -> None:
+        """Find the active zone."""
+        if previous is not None and previous.zones is self.zones:
+            object.__setattr__(self, "active_zone", previous.active_zone)
+            object.__setattr__(self, "_default_zone_name", previous._default_zone_name)
+            return
+        active_zone = next((z for z in self.zones if z.active), None)
+        default_zone = active_zone or (self.zones[0] if self.zones else None)
+        object.__setattr__(self, "active_zone", active_zone)
+        object.__setattr__(
+            self, "_default_zone_name", default_zone.name if default_zone else None
+        )
 
     def get_active_zone_name(self) -> str | None:
         """Get the current active zone name."""
-        return next((z.name for z in self.zones if z.active), None)
+        return self.active_zone.name if self.active_zone else None
 
     def get_active_zone_id(self) -> int | None:
         """Get the current active zone id."""
-        return next((z.id for z in self.zones if z.active), None)
+        return self.active_zone.id if self.active_zone else None
 
     def get_playback_info(self, target_zone: str | None) -> PlaybackInfo | None:
         """Get PlaybackInfo for the given zone if provided or the currently active zone."""
         return self._get_val_for_zone(self.playback_info_by_zone, target_zone)
 
-    def get_position_updated_at(self, target_zone: str | None) -> dt.datetime | None:
-        """Get last position updated at for the given zone if provided or the currently active zone."""
-        return self._get_val_for_zone(self.position_updated_at_by_zone, target_zone)
+    def get_position(self, target_zone: str | None) -> PlaybackPosition | None:
+        """Get the PlaybackPosition for the given zone if provided or the currently active zone."""
+        return self._get_val_for_zone(self.position_by_zone, target_zone)
+
+    def get_playback_info_updated_at(
+        self, target_zone: str | None
+    ) -> dt.datetime | None:
+        """Get when the last PlaybackInfo was requested for the given zone if provided or the currently active zone."""
+        return self._get_val_for_zone(
+            self.playback_info_updated_at_by_zone, target_zone
+        )
+
+    def is_stale(self, target_zone: str | None) -> bool:
+        """Check if the last fetch failed for the given zone if provided or the currently active zone."""
+        return self.resolve_zone_name(target_zone) in self.stale_zones
+
+    def resolve_zone_name(self, target_zone: str | None) -> str | None:
+        """Get the given zone name if provided or the currently active zone name."""
+        return target_zone or self._default_zone_name
 
     def _get_val_for_zone(
         self, vals: dict[str, V], target_zone: str | None
     ) -> V | None:
-        if target_zone:
-            return vals.get(target_zone)
-        active_zone = next((z for z in self.zones if z.active), None)
-        if not active_zone and self.zones:
-            active_zone = self.zones[0]
-        if active_zone:
-            return vals.get(active_zone.name, None)
-        return None
+        zone_name = self.resolve_zone_name(target_zone)
+        return vals.get(zone_name, None) if zone_name else None
+
+    def find_changes(self, previous: MediaServerData) -> set[Any]:
+        """Get the contexts which have changed since the previous data."""
+        changes: set[Any] = {
+            zone_context(zone_name)
+            for zone_name in self.playback_info_by_zone.keys()
+            | previous.playback_info_by_zone.keys()
+            if playback_info_changed(
+                previous.playback_info_by_zone.get(zone_name),
+                self.playback_info_by_zone.get(zone_name),
+            )
+        }
+        changes.update(
+            zone_context(zone_name)
+            for zone_name in self.stale_zones ^ previous.stale_zones
+        )
+        if self.get_active_zone_name() != previous.get_active_zone_name():
+            changes.add(CONTEXT_ACTIVE_ZONE)
+        target_zone = self.resolve_zone_name(None)
+        if (
+            target_zone != previous.resolve_zone_name(None)
+            or zone_context(target_zone) in changes
+        ):
+            changes.add(zone_context(None))
+        if self.view_mode != previous.view_mode:
+            changes.add(CONTEXT_VIEW_MODE)
+        if self.browse_paths is not previous.browse_paths:
+            changes.add(CONTEXT_BROWSE_PATHS)
+        return changes
+
+
+def _is_due(last: dt.datetime | None, interval: int, now: dt.datetime) -> bool:
+    """Check if a refresh last done at the given time is due again."""
+    return last is None or (now - last).total_seconds() >= interval
 
 
 class MediaServerUpdateCoordinator(DataUpdateCoordinator[MediaServerData]):
@@ -85,111 +271,597 @@ class MediaServerUpdateCoordinator(DataUpdateCoordinator[MediaServerData]):
         hass: HomeAssistant,
         media_server: MediaServer,
         extra_fields: list[str] | None,
+        poll_timeout: float = DEFAULT_POLL_TIMEOUT,
+        request_slots: asyncio.Semaphore | None = None,
+        store: Store[dict[str, Any]] | None = None,
     ) -> None:
-        """Initialize."""
+        """Initialize, each poll has to complete within poll_timeout seconds.
+
+        Polls are started by the PollScheduler according to poll_interval, the
+        requests made by a poll wait for one of the request_slots if given. The
+        slow changing data is saved to the store, if given, for the next start.
+        """
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=dt.timedelta(seconds=1),
+            # coalesce the refreshes requested by a burst of commands
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=REFRESH_COMMAND_COOLDOWN, immediate=False
+            ),
         )
         self._media_server = media_server
         self.data = MediaServerData()
         self._extra_fields = extra_fields
         self._last_path_refresh: dt.datetime | None = None
+        # the server version the browse paths were loaded from
+        self._paths_version: str | None = None
+        self._path_retry_at: dt.datetime | None = None
+        self._path_refresh: asyncio.Task[None] | None = None
+        # browse results, cleared when the server version or the browse paths change
+        self.browse_cache = BrowseCache()
+        self._idle_polls: int = 0
+        self._changes: set[Any] | None = None
+        self._last_server_refresh: dt.datetime | None = None
+        self._last_view_mode_refresh: dt.datetime | None = None
+        self._zone_backoff: dict[str, ZoneBackoff] = {}
+        self.poll_interval = dt.timedelta(seconds=POLL_INTERVAL_ACTIVE)
+        self._poll_timeout = poll_timeout
+        self._request_slots = request_slots
+        self._store = store
+        self._deadline: float = 0.0
+        self._connect_failures: int = 0
+        self._offline_probes: int = 0
+        # polls share the state of the poll in progress so must not overlap
+        self._poll_lock = asyncio.Lock()
+        # listeners without a context want every zone
+        self._listeners_without_context: int = 0
+        # when commands were last sent for each context, the listeners are updated
+        # by the first poll that observes the effect of the command
+        self._commands: dict[Any, dt.datetime] = {}
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, counting the listeners without a context."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        if context is not None:
+            return remove_listener
+        self._listeners_without_context += 1
+
+        @callback
+        def _remove_listener() -> None:
+            self._listeners_without_context -= 1
+            remove_listener()
+
+        return _remove_listener
+
+    @callback
+    def async_command_sent(self, contexts: Collection[Any] = ()) -> None:
+        """Poll actively and reload the view mode to pick up the effect of a command.
+
+        The listeners for the given contexts are updated by the first poll started
+        after the command, even if nothing changed, e.g. as the server ignored it.
+        """
+        sent_at = dt_util.utcnow()
+        for context in contexts:
+            self._commands[context] = sent_at
+        self._idle_polls = 0
+        self._last_view_mode_refresh = None
+        self.poll_interval = dt.timedelta(seconds=POLL_INTERVAL_ACTIVE)
+
+    async def async_load_cache(self) -> bool:
+        """Start from the data saved by the last run, returns False if there is none."""
+        if self._store is None or not (saved := await self._store.async_load()):
+            return False
+        try:
+            cached = CachedServer.from_dict(saved)
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring invalid cached data: %r", err)
+            return False
+        self._last_path_refresh = cached.last_path_refresh
+        if cached.browse_paths is not None:
+            self._paths_version = cached.server_info.version
+        self.data = MediaServerData(
+            server_info=cached.server_info,
+            capabilities=get_capabilities(cached.server_info),
+            zones=cached.zones,
+            view_mode=cached.view_mode,
+            browse_paths=cached.browse_paths,
+        )
+        return True
 
-    async def _refresh_paths_if_necessary(
-        self, current_version: str
-    ) -> list[BrowsePath]:
-        async def _get_paths() -> list[BrowsePath]:
-            try:
-                browse_rules = convert_browse_rules(
-                    await self._media_server.get_browse_rules()
-                )
-                playlist_path = BrowsePath("Playlists")
-                playlist_path.media_types.append(MediaType.PLAYLIST)
-                browse_rules.append(playlist_path)
-                return browse_rules
-            finally:
-                self._last_path_refresh = dt_util.utcnow()
-
-        if not _can_refresh_paths(self._media_server):
-            return []
-
+    @callback
+    def _save_cache(self, data: MediaServerData) -> None:
+        """Save the slow changing data if it changed."""
         if (
-            self.data.browse_paths is None
-            or self._last_path_refresh is None
-            or self.data.server_info is None
+            self._store is None
+            or data.server_info is None
+            or (
+                data.server_info == self.data.server_info
+                and data.zones is self.data.zones
+                and data.view_mode == self.data.view_mode
+                and data.browse_paths is self.data.browse_paths
+            )
         ):
-            return await _get_paths()
+            return
+        cached = CachedServer(
+            data.server_info,
+            data.zones,
+            data.view_mode,
+            data.browse_paths,
+            self._last_path_refresh,
+        )
+        self._store.async_delay_save(cached.as_dict, CACHE_SAVE_DELAY)
+
+    @callback
+    def async_wake_requested(self) -> None:
+        """Poll fully again straight away as the server should be waking up."""
+        self._connect_failures = 0
+        self._offline_probes = 0
+        self.async_command_sent()
+
+    def _is_offline(self) -> bool:
+        """Check if the server is unreachable so only its liveness is checked."""
+        return self._connect_failures >= OFFLINE_AFTER_FAILURES
+
+    @property
+    def _server_name(self) -> str:
+        info = self._media_server.media_server_info
+        return info.name if info else "Unknown"
+
+    def _connect_failed(self) -> None:
+        """Count a failure to reach the server, backing off further when offline."""
+        self._connect_failures += 1
+        if not self._is_offline():
+            return
+        interval = dt.timedelta(
+            seconds=min(
+                OFFLINE_PROBE_INTERVAL_MIN * 2**self._offline_probes,
+                OFFLINE_PROBE_INTERVAL_MAX,
+            )
+        )
+        if self._offline_probes == 0:
+            _LOGGER.info(
+                "[%s] Server is unreachable, checking again every %s",
+                self._server_name,
+                interval,
+            )
+        self._offline_probes += 1
+        self.poll_interval = interval
+
+    async def _probe_offline_server(self) -> None:
+        """Check the offline server is reachable before attempting a full poll."""
+        await self._within_deadline(self._media_server.alive)
+        _LOGGER.info("[%s] Server is reachable again", self._server_name)
+        self._connect_failures = 0
+        self._offline_probes = 0
+        self._last_server_refresh = None
+        self.poll_interval = dt.timedelta(seconds=POLL_INTERVAL_ACTIVE)
+
+    def _update_poll_interval(self, data: MediaServerData) -> None:
+        """Poll quickly while playing, back off progressively while idle."""
+        if any(
+            info.state in (PlaybackState.PLAYING, PlaybackState.WAITING)
+            for info in data.playback_info_by_zone.values()
+        ):
+            self._idle_polls = 0
+        elif data.view_mode == ViewMode.NO_UI:
+            # nothing playing and nobody looking at the UI, go straight to the slowest
+            self._idle_polls = max(
+                self._idle_polls + 1,
+                IDLE_POLLS_PER_STEP * (len(POLL_INTERVALS_IDLE) - 1),
+            )
+        else:
+            self._idle_polls += 1
 
-        since_last = (dt_util.utcnow() - self._last_path_refresh).total_seconds()
-        if since_last >= 900:
-            _LOGGER.debug("Reloading paths, %d seconds since last refresh", since_last)
-            return await _get_paths()
+        step = min(
+            self._idle_polls // IDLE_POLLS_PER_STEP, len(POLL_INTERVALS_IDLE) - 1
+        )
+        interval = dt.timedelta(seconds=POLL_INTERVALS_IDLE[step])
+        if interval != self.poll_interval:
+            _LOGGER.debug(
+                "[%s] Poll interval %s -> %s",
+                self._media_server.media_server_info.name,
+                self.poll_interval,
+                interval,
+            )
+            self.poll_interval = interval
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners whose context changed in the last refresh.
+
+        Contexts are collections of the CONTEXT_* values and zone_context, all
+        listeners are updated if the changes are unknown, e.g. after a failure.
+        """
+        changes, self._changes = self._changes, None
+        if changes is None or not self.last_update_success:
+            super().async_update_listeners()
+            return
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or not changes.isdisjoint(context):
+                update_callback()
+
+    def _get_zones_to_poll(self, zones: list[Zone]) -> list[Zone]:
+        """Get the zones that some listener is interested in plus the active zone.
+
+        All zones are polled until some listener subscribes to a context, or while
+        a listener without a context is registered.
+        """
+        if self._listeners_without_context:
+            return zones
+        zone_names: set[str | None] = set()
+        subscribed = False
+        for contexts in self.async_contexts():
+            subscribed = True
+            zone_names.update(
+                c.zone_name for c in contexts if isinstance(c, ZoneContext)
+            )
+        if not subscribed:
+            return zones
+        if zones is self.data.zones:
+            zone_names.add(self.data.resolve_zone_name(None))
+        else:
+            active_zone = next(
+                (z for z in zones if z.active), zones[0] if zones else None
+            )
+            zone_names.add(active_zone.name if active_zone else None)
+        return [z for z in zones if z.name in zone_names]
+
+    def _select_zones_to_poll(self, zones: list[Zone], now: dt.datetime) -> list[Zone]:
+        """Get the zones to poll now, idle zones share what is left of the budget.
+
+        The active zone, playing zones, zones without data and zones sent a command
+        are polled every time, the remaining zones are polled in order of how long
+        since they were last polled. Zones that failed recently are skipped until
+        their retry is due.
+        """
+        infos = self.data.playback_info_by_zone
+        updated_at = self.data.playback_info_updated_at_by_zone
+        priority: list[Zone] = []
+        idle: list[Zone] = []
+        for zone in zones:
+            backoff = self._zone_backoff.get(zone.name)
+            if backoff and backoff.retry_at > now:
+                continue
+            info = infos.get(zone.name)
+            if (
+                zone.active
+                or info is None
+                or zone.name not in updated_at
+                or info.state in (PlaybackState.PLAYING, PlaybackState.WAITING)
+                or zone_context(zone.name) in self._commands
+            ):
+                priority.append(zone)
+            else:
+                idle.append(zone)
+        idle.sort(key=lambda z: updated_at[z.name])
+        return priority + idle[: max(1, POLL_ZONE_BUDGET - len(priority))]
+
+    def _pop_observed_commands(
+        self, data: MediaServerData, polled_at: dt.datetime
+    ) -> set[Any]:
+        """Get the contexts of the commands sent before the poll started at polled_at.
+
+        A zone's command is only observed once the zone has been polled.
+        """
+        observed: set[Any] = set()
+        for context, sent_at in list(self._commands.items()):
+            if sent_at >= polled_at:
+                continue
+            if isinstance(context, ZoneContext):
+                zone_polled_at = data.get_playback_info_updated_at(context.zone_name)
+                if zone_polled_at is None or zone_polled_at < polled_at:
+                    continue
+            del self._commands[context]
+            observed.add(context)
+        return observed
+
+    async def _within_deadline(
+        self, call: Callable[[], Awaitable[V]], share: float = 1.0
+    ) -> V:
+        """Make the call within its share of the time left in the current poll.
+
+        Time spent waiting for a request slot, i.e. for other servers, does not
+        count against the deadline and the call is only made once it has a slot.
+        """
+        timeout = max(self._deadline - self.hass.loop.time(), 0.0) * share
+        if self._request_slots is None:
+            async with asyncio.timeout(timeout):
+                return await call()
+        async with self._request_slots:
+            async with asyncio.timeout(timeout):
+                return await call()
+
+    async def _get_playback_info(self, zone: Zone) -> PlaybackInfo:
+        """Fetch the PlaybackInfo for the zone, the active zone is fetched by default.
+
+        Extra fields are only fetched when the file or playback state changes,
+        otherwise they are copied from the last known PlaybackInfo for the zone.
+        """
+        target = None if zone.active else zone
+        last_info = self.data.playback_info_by_zone.get(zone.name)
+        if not self._extra_fields or last_info is None:
+            return await self._media_server.get_playback_info(
+                target, extra_fields=self._extra_fields
+            )
+        info = await self._media_server.get_playback_info(target)
+        if info.zone_name not in ("", zone.name):
+            last_info = self.data.playback_info_by_zone.get(info.zone_name)
+        if (
+            last_info
+            and info.file_key == last_info.file_key
+            and info.state == last_info.state
+        ):
+            # the info may be shared with other callers so is not modified
+            info = copy.copy(info)
+            info.extra_fields = last_info.extra_fields
+            return info
+        return await self._media_server.get_playback_info(
+            target, extra_fields=self._extra_fields
+        )
 
-        if self.data.server_info.version != current_version:
+    @callback
+    def _refresh_paths_if_necessary(self, capabilities: ServerCapabilities) -> None:
+        """Start reloading the browse paths in the background if they are due.
+
+        Only one reload runs at a time, the poll does not wait for it.
+        """
+        if not capabilities.can_refresh_paths:
+            return
+        current_version = capabilities.version
+        if self._path_refresh and not self._path_refresh.done():
+            return
+        now = dt_util.utcnow()
+        if self._path_retry_at and now < self._path_retry_at:
+            return
+        if self._paths_version is None:
+            _LOGGER.debug("[%s] Loading paths", self._server_name)
+        elif self._paths_version != current_version:
             _LOGGER.debug(
-                "Reloading paths, version change from %s to %s",
-                self.data.server_info.version,
+                "[%s] Reloading paths, version change from %s to %s",
+                self._server_name,
+                self._paths_version,
                 current_version,
             )
-            return await _get_paths()
+        elif _is_due(self._last_path_refresh, REFRESH_INTERVAL_PATHS, now):
+            _LOGGER.debug("[%s] Reloading paths", self._server_name)
+        else:
+            return
+        name = f"jriver browse paths {self._server_name}"
+        refresh = self._async_refresh_paths(current_version)
+        # not started eagerly, the paths are swapped into the data of this poll so
+        # must not land before it is set
+        if self.config_entry:
+            self._path_refresh = self.config_entry.async_create_background_task(
+                self.hass, refresh, name, eager_start=False
+            )
+        else:
+            self._path_refresh = self.hass.async_create_background_task(
+                refresh, name, eager_start=False
+            )
 
-        return self.data.browse_paths
+    async def _async_refresh_paths(self, version: str) -> None:
+        """Load the browse paths and swap them into the data.
+
+        The current paths are kept if they cannot be loaded, the load is retried
+        after RETRY_INTERVAL_PATHS.
+        """
+        try:
+            browse_paths = convert_browse_rules(
+                await self._media_server.get_browse_rules()
+            )
+        except (
+            CannotConnectError,
+            MediaServerError,
+            InvalidRequestError,
+            TimeoutError,
+        ) as err:
+            _LOGGER.debug(
+                "[%s] Unable to load browse paths: %r", self._server_name, err
+            )
+            self._path_retry_at = dt_util.utcnow() + dt.timedelta(
+                seconds=RETRY_INTERVAL_PATHS
+            )
+            return
+        playlist_path = BrowsePath("Playlists")
+        playlist_path.media_types.append(MediaType.PLAYLIST)
+        browse_paths.append(playlist_path)
+
+        self._path_retry_at = None
+        self._last_path_refresh = dt_util.utcnow()
+        self._paths_version = version
+        self.browse_cache.clear()
+        new_data = replace(self.data, browse_paths=browse_paths, previous=self.data)
+        self._save_cache(new_data)
+        self.data = new_data
+        self._changes = {CONTEXT_BROWSE_PATHS}
+        self.async_update_listeners()
 
     async def _async_update_data(self) -> MediaServerData:
-        """Fetch the latest status."""
+        """Fetch the latest status once any poll already in progress completes.
+
+        Polls are started by the scheduler, by the first refresh in the background
+        on a warm start and by refreshes requested after a command.
+        """
+        async with self._poll_lock:
+            return await self._async_poll()
+
+    async def _async_poll(self) -> MediaServerData:
+        """Fetch the latest status.
+
+        Playback info is fetched on every poll, the view mode and the server info
+        plus zone list are refreshed less often. The active zone is polled without
+        naming the zone so a change in active zone is seen on every poll.
+
+        Every call has to complete within its share of the poll deadline, a zone
+        which is too slow to respond is treated as a failed zone.
+        """
+        # availability changes when recovering from a failure so update everything
+        recovering = not self.last_update_success
+        self._changes = None
+        self._deadline = self.hass.loop.time() + self._poll_timeout
+        now = dt_util.utcnow()
         try:
-            server_info, zones, view_mode = await asyncio.gather(
-                self._media_server.alive(),
-                self._media_server.get_zones(),
-                self._media_server.get_view_mode(),
-            )
-            zone_tasks: list[asyncio.Task]
-            async with asyncio.TaskGroup() as tg:
-                zone_tasks = [
-                    tg.create_task(
-                        self._media_server.get_playback_info(
-                            zone, extra_fields=self._extra_fields
-                        )
+            if self._is_offline():
+                await self._probe_offline_server()
+            server_info = self.data.server_info
+            zones = self.data.zones
+            if _is_due(self._last_server_refresh, REFRESH_INTERVAL_SERVER, now):
+                server_info, zones = await asyncio.gather(
+                    self._within_deadline(
+                        self._media_server.alive, 1 - POLL_DEADLINE_ZONE_SHARE
+                    ),
+                    self._within_deadline(
+                        self._media_server.get_zones, 1 - POLL_DEADLINE_ZONE_SHARE
+                    ),
+                )
+                self._last_server_refresh = now
+            capabilities = self.data.capabilities
+            if server_info.version != capabilities.version:
+                capabilities = get_capabilities(server_info)
+                self.browse_cache.clear()
+
+            view_mode = self.data.view_mode
+            view_mode_due = _is_due(
+                self._last_view_mode_refresh, REFRESH_INTERVAL_VIEW_MODE, now
+            )
+            polled_zones = self._select_zones_to_poll(
+                self._get_zones_to_poll(zones), now
+            )
+            # a failing zone must not cancel the fetches for the others
+            calls: list[Callable[[], Awaitable[Any]]] = [
+                partial(self._get_playback_info, zone) for zone in polled_zones
+            ]
+            if view_mode_due:
+                calls.append(self._media_server.get_view_mode)
+            results = await asyncio.gather(
+                *(self._within_deadline(c, POLL_DEADLINE_ZONE_SHARE) for c in calls),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException) and not isinstance(
+                    result,
+                    (
+                        CannotConnectError,
+                        MediaServerError,
+                        InvalidRequestError,
+                        TimeoutError,
+                    ),
+                ):
+                    raise result
+
+            if view_mode_due:
+                view_mode_result = results.pop()
+                if isinstance(view_mode_result, BaseException):
+                    _LOGGER.debug(
+                        "[%s] Unable to get view mode: %r",
+                        self._media_server.media_server_info.name,
+                        view_mode_result,
                     )
-                    for zone in zones
-                ]
+                else:
+                    view_mode = view_mode_result
+                    self._last_view_mode_refresh = now
+
+            failures = [r for r in results if isinstance(r, BaseException)]
+            if failures and len(failures) == len(polled_zones):
+                # nothing answered so the problem is the server, not the zones
+                self._zone_backoff.clear()
+                raise failures[0]
 
             playback_info_by_zone: dict[str, PlaybackInfo] = {}
-            position_updated_at_by_zone: dict[str, dt.datetime] = {}
+            position_by_zone: dict[str, PlaybackPosition] = {}
+            playback_info_updated_at_by_zone: dict[str, dt.datetime] = {}
             pos_updated_at = dt_util.utcnow()
-
-            for i, task in enumerate(zone_tasks):
-                zone_name = zones[i].name
-                playback_info: PlaybackInfo = task.result()
-                playback_info_by_zone[zone_name] = playback_info
-                last_info = self.data.playback_info_by_zone.get(zone_name, None)
-                if playback_info.position_ms:
-                    delta = (
-                        playback_info.position_ms - last_info.position_ms
-                        if last_info
-                        else 0
-                    )
+            zones_changed = False
+
+            for zone, playback_info in zip(polled_zones, results):
+                if isinstance(playback_info, BaseException):
+                    backoff = self._zone_backoff.get(
+                        zone.name, ZoneBackoff(0, now)
+                    ).next(now)
+                    self._zone_backoff[zone.name] = backoff
                     _LOGGER.debug(
-                        "[%s] Updated %s position by %d to %d",
+                        "[%s] Unable to get playback info for %s (%d failures): %r",
                         self._media_server.media_server_info.name,
-                        zone_name,
-                        delta,
+                        zone.name,
+                        backoff.failures,
+                        playback_info,
+                    )
+                    continue
+                self._zone_backoff.pop(zone.name, None)
+                zone_name = zone.name
+                if zone.active and playback_info.zone_name not in ("", zone.name):
+                    zones_changed = True
+                    zone_name = playback_info.zone_name
+                last_info = self.data.playback_info_by_zone.get(zone_name)
+                if not playback_info_changed(last_info, playback_info):
+                    playback_info = last_info
+                playback_info_by_zone[zone_name] = playback_info
+                playback_info_updated_at_by_zone[zone_name] = now
+                last_position = self.data.position_by_zone.get(zone_name)
+                if last_position is None:
+                    position = PlaybackPosition(
                         playback_info.position_ms,
+                        pos_updated_at,
+                        playback_info.state == PlaybackState.PLAYING,
                     )
-                    position_updated_at_by_zone[zone_name] = pos_updated_at
+                else:
+                    position = last_position.sync(playback_info, pos_updated_at)
+                    if position is not last_position:
+                        _LOGGER.debug(
+                            "[%s] Resync %s position by %d to %d",
+                            self._media_server.media_server_info.name,
+                            zone_name,
+                            playback_info.position_ms
+                            - last_position.predict(pos_updated_at),
+                            playback_info.position_ms,
+                        )
+                position_by_zone[zone_name] = position
+
+            if zones_changed:
+                # active zone moved or an unknown zone appeared
+                zones = await self._within_deadline(self._media_server.get_zones)
+            if _same_zones(self.data.zones, zones):
+                zones = self.data.zones
+
+            # zones not polled in this cycle, or which failed, keep their last known
+            # state
+            wanted_zones = self._get_zones_to_poll(zones)
+            for zone in wanted_zones:
+                if zone.name in playback_info_by_zone:
+                    continue
+                for last_vals, vals in (
+                    (self.data.playback_info_by_zone, playback_info_by_zone),
+                    (self.data.position_by_zone, position_by_zone),
+                    (
+                        self.data.playback_info_updated_at_by_zone,
+                        playback_info_updated_at_by_zone,
+                    ),
+                ):
+                    if zone.name in last_vals:
+                        vals[zone.name] = last_vals[zone.name]
 
             new_data = MediaServerData(
                 server_info=server_info,
-                playback_info_by_zone=playback_info_by_zone,
-                position_updated_at_by_zone=position_updated_at_by_zone,
+                capabilities=capabilities,
+                playback_info_by_zone=_reuse(
+                    self.data.playback_info_by_zone, playback_info_by_zone
+                ),
+                position_by_zone=_reuse(self.data.position_by_zone, position_by_zone),
+                playback_info_updated_at_by_zone=_reuse(
+                    self.data.playback_info_updated_at_by_zone,
+                    playback_info_updated_at_by_zone,
+                ),
                 zones=zones,
                 view_mode=view_mode,
-                browse_paths=await self._refresh_paths_if_necessary(
-                    server_info.version
+                browse_paths=self.data.browse_paths,
+                stale_zones=frozenset(
+                    z.name for z in wanted_zones if z.name in self._zone_backoff
                 ),
+                previous=self.data,
             )
 
             last_zone = self.data.get_active_zone_name()
@@ -203,19 +875,35 @@ class MediaServerUpdateCoordinator(DataUpdateCoordinator[MediaServerData]):
                     new_zone,
                 )
 
+            self._connect_failures = 0
+            self._refresh_paths_if_necessary(capabilities)
+            self._save_cache(new_data)
+            self._update_poll_interval(new_data)
+            observed = self._pop_observed_commands(new_data, now)
+            if not recovering:
+                self._changes = new_data.find_changes(self.data) | observed
+
         except InvalidAuthError as err:
             raise ConfigEntryAuthFailed from err
-        except (CannotConnectError, MediaServerError, InvalidRequestError) as err:
+        except (
+            CannotConnectError,
+            MediaServerError,
+            InvalidRequestError,
+            TimeoutError,
+        ) as err:
+            # reload everything once the server is back
+            self._last_server_refresh = None
+            self._last_view_mode_refresh = None
+            if isinstance(err, (CannotConnectError, TimeoutError)):
+                self._connect_failed()
             if _LOGGER.isEnabledFor(logging.DEBUG):
-                n = (
-                    self._media_server.media_server_info.name
-                    if self._media_server.media_server_info
-                    else "Unknown"
-                )
                 formatted = str(err)
                 detail = f" - {formatted}" if formatted else ""
                 _LOGGER.debug(
-                    "[%s] Update failure due to %s%s", n, type(err).__name__, detail
+                    "[%s] Update failure due to %s%s",
+                    self._server_name,
+                    type(err).__name__,
+                    detail,
                 )
             raise UpdateFailed from err
         else:
@@ -1,5 +1,5 @@
 """MediaServer entity base."""
-from collections.abc import Awaitable, Callable, Coroutine
+from collections.abc import Awaitable, Callable, Collection, Coroutine
 from functools import wraps
 import logging
 from typing import Any, Concatenate, ParamSpec, TypeVar
@@ -7,6 +7,7 @@ from typing import Any, Concatenate, ParamSpec, TypeVar
 from hamcws import CannotConnectError
 
 from homeassistant.auth import InvalidAuthError
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -26,9 +27,10 @@ class MediaServerEntity(CoordinatorEntity[MediaServerUpdateCoordinator]):
         coordinator: MediaServerUpdateCoordinator,
         unique_id: str,
         name: str,
+        contexts: Collection[Any] | None = None,
     ) -> None:
-        """Initialize the entity."""
-        super().__init__(coordinator)
+        """Initialize the entity, only updating on changes to the given contexts."""
+        super().__init__(coordinator, frozenset(contexts) if contexts else None)
 
         self._attr_unique_id = unique_id
         info = coordinator.data.server_info
@@ -40,6 +42,15 @@ class MediaServerEntity(CoordinatorEntity[MediaServerUpdateCoordinator]):
             name=name,
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Pick up the current data as the coordinator only sends changes."""
+        await super().async_added_to_hass()
+        self._handle_coordinator_update()
+
+    @callback
+    def _async_command_done(self, success: bool) -> None:
+        """Handle completion of a command sent by this entity."""
+
 
 _MediaServerEntityT = TypeVar("_MediaServerEntityT", bound="MediaServerEntity")
 _P = ParamSpec("_P")
@@ -55,9 +66,10 @@ def cmd(
         obj: _MediaServerEntityT, *args: _P.args, **kwargs: _P.kwargs
     ) -> None:
         """Wrap all command methods."""
+        success = False
         try:
             await func(obj, *args, **kwargs)
-            await obj.coordinator.async_request_refresh()
+            success = True
         except (CannotConnectError, InvalidAuthError) as exc:
             _LOGGER.error(
                 "Error calling %s on entity %s: %r",
@@ -65,5 +77,11 @@ def cmd(
                 obj.entity_id,
                 exc,
             )
+        finally:
+            # any failure, including those raised to the caller, rolls back
+            obj._async_command_done(success)
+        if success:
+            obj.coordinator.async_command_sent(obj.coordinator_context or ())
+            await obj.coordinator.async_request_refresh()
 
     return wrapper
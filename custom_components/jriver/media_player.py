@@ -3,12 +3,12 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Mapping
+import copy
 import datetime as dt
 import logging
 from typing import Any
 
 from hamcws import (
-    BrowsePath,
     MediaServer,
     PlaybackInfo,
     PlaybackState,
@@ -42,9 +42,14 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+from homeassistant.util import dt as dt_util
 
 from . import MediaServerUpdateCoordinator, _translate_to_media_type
-from .browse_media import browse_nodes, media_source_content_filter
+from .browse_media import (
+    BrowsePathIndex,
+    browse_nodes,
+    media_source_content_filter,
+)
 from .const import (
     CONF_BROWSE_PATHS,
     CONF_DEVICE_PER_ZONE,
@@ -60,7 +65,12 @@ from .const import (
     DEFAULT_SSL,
     DEFAULT_TIMEOUT,
     DOMAIN,
-    _can_refresh_paths,
+)
+from .coordinator import (
+    CONTEXT_BROWSE_PATHS,
+    PlaybackPosition,
+    playback_info_changed,
+    zone_context,
 )
 from .entity import MediaServerEntity, cmd
 
@@ -248,22 +258,92 @@ class JRiverMediaPlayer(MediaServerEntity, MediaPlayerEntity):
         zone_name: str | None = None,
     ) -> None:
         """Initialize the MediaServer entity."""
-        super().__init__(coordinator, uid, name)
+        super().__init__(
+            coordinator, uid, name, (zone_context(zone_name), CONTEXT_BROWSE_PATHS)
+        )
         self._media_server: MediaServer = media_server
         self._playback_info: PlaybackInfo | None = None
-        self._position_updated_at: dt.datetime | None = None
+        self._position: PlaybackPosition | None = None
+        self._last_available: bool | None = None
+        self._stale: bool = False
+        self._optimistic: dict[str, Any] = {}
+        self._optimistic_position: PlaybackPosition | None = None
+        self._optimistic_at: dt.datetime | None = None
         self._conf_browse_paths = (
             parse_browse_paths_from_text(browse_paths) if browse_paths else None
         )
-        self._browse_paths: list[BrowsePath] | None = None
+        self._browse_paths: BrowsePathIndex | None = None
         self._extra_fields = extra_fields
         self._target_zone: str | None = zone_name
 
     def _reset_state(self):
         _LOGGER.debug("Resetting state")
-        self._position_updated_at = None
+        self._position = None
         self._playback_info = None
         self._browse_paths = None
+        self._clear_optimistic()
+
+    def _clear_optimistic(self) -> None:
+        self._optimistic = {}
+        self._optimistic_position = None
+        self._optimistic_at = None
+
+    def _is_optimistic(self) -> bool:
+        """Check if optimistic values are waiting for a poll that started after them."""
+        if self._optimistic_at is None:
+            return False
+        polled_at = self.coordinator.data.get_playback_info_updated_at(
+            self._target_zone
+        )
+        if polled_at is not None and polled_at > self._optimistic_at:
+            self._clear_optimistic()
+            return False
+        return True
+
+    def _apply_optimistic(
+        self, playback_info: PlaybackInfo | None
+    ) -> PlaybackInfo | None:
+        """Overlay the optimistic values on a copy of the given PlaybackInfo."""
+        if not playback_info or not self._optimistic:
+            return playback_info
+        playback_info = copy.copy(playback_info)
+        for attr, value in self._optimistic.items():
+            setattr(playback_info, attr, value)
+        return playback_info
+
+    @callback
+    def _set_optimistic(
+        self, position: PlaybackPosition | None = None, **values: Any
+    ) -> None:
+        """Show the expected result of a command until the next poll confirms it."""
+        if not self._playback_info:
+            return
+        self._optimistic.update(values)
+        if position:
+            self._optimistic_position = position
+        self._optimistic_at = dt_util.utcnow()
+        self._handle_coordinator_update()
+
+    @callback
+    def _set_optimistic_state(self, state: PlaybackState) -> None:
+        """Show the expected playback state, the position stops or starts moving."""
+        now = dt_util.utcnow()
+        position = self._position
+        playing = state == PlaybackState.PLAYING
+        if position and position.playing != playing:
+            position = PlaybackPosition(position.predict(now), now, playing)
+        self._set_optimistic(position, state=state)
+
+    @callback
+    def _async_command_done(self, success: bool) -> None:
+        """Wait for a poll after the command completed or roll back if it failed."""
+        if self._optimistic_at is None:
+            return
+        if success:
+            self._optimistic_at = dt_util.utcnow()
+            return
+        self._clear_optimistic()
+        self._handle_coordinator_update()
 
     async def _clear_connection(self, close=True):
         _LOGGER.debug("Clearing connection (close=%s)", close)
@@ -295,21 +375,49 @@ class JRiverMediaPlayer(MediaServerEntity, MediaPlayerEntity):
         return {
             "zone_name": self._playback_info.zone_name,
             **self._playback_info.extra_fields,
+            # the last fetch for this zone failed, the values may be out of date
+            **({"stale": True} if self._stale else {}),
         }
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._position_updated_at = self.coordinator.data.get_position_updated_at(
-            self._target_zone
+        """Handle updated data from the coordinator.
+
+        State is only written when something other than the position changes or if
+        the position has drifted from where it is expected to be. Optimistic values
+        from a command are shown until a poll started after the command completed.
+        """
+        position = self.coordinator.data.get_position(self._target_zone)
+        playback_info = self.coordinator.data.get_playback_info(self._target_zone)
+        if self._is_optimistic():
+            playback_info = self._apply_optimistic(playback_info)
+            position = self._optimistic_position or position
+        available = self.available
+        stale = self.coordinator.data.is_stale(self._target_zone)
+        changed = (
+            available != self._last_available
+            or stale != self._stale
+            or position is not self._position
+            or playback_info_changed(
+                self._playback_info, playback_info, ignore_position=True
+            )
         )
-        self._playback_info = self.coordinator.data.get_playback_info(self._target_zone)
-        self._browse_paths = (
+        self._last_available = available
+        self._stale = stale
+        self._position = position
+        self._playback_info = playback_info
+        browse_paths = (
             self.coordinator.data.browse_paths
-            if _can_refresh_paths(self._media_server)
+            if self.coordinator.data.capabilities.can_refresh_paths
             else self._conf_browse_paths
         )
-        self.async_write_ha_state()
+        if not browse_paths:
+            self._browse_paths = None
+        elif not self._browse_paths or browse_paths is not self._browse_paths.paths:
+            # index the paths once, not on every browse
+            self._browse_paths = BrowsePathIndex(browse_paths)
+        if changed:
+            self.async_write_ha_state()
 
     @property
     def volume_level(self) -> float | None:
@@ -364,15 +472,15 @@ class JRiverMediaPlayer(MediaServerEntity, MediaPlayerEntity):
         if self._playback_info.live_input:
             return None
 
-        if not self._playback_info.position_ms or self._playback_info.position_ms < 0:
+        if not self._position or self._position.position_ms <= 0:
             return None
 
-        return round(self._playback_info.position_ms / 1000)
+        return round(self._position.position_ms / 1000)
 
     @property
     def media_position_updated_at(self) -> dt.datetime | None:
         """Last valid time of media position."""
-        return self._position_updated_at
+        return self._position.updated_at if self._position else None
 
     @property
     def media_image_url(self) -> str | None:
@@ -444,41 +552,59 @@ class JRiverMediaPlayer(MediaServerEntity, MediaPlayerEntity):
     @cmd
     async def async_volume_up(self) -> None:
         """Volume up the media player."""
-        await self._media_server.volume_up(zone=self._target_zone)
+        volume = await self._media_server.volume_up(zone=self._target_zone)
+        self._set_optimistic(volume=volume)
 
     @cmd
     async def async_volume_down(self) -> None:
         """Volume down the media player."""
-        await self._media_server.volume_down(zone=self._target_zone)
+        volume = await self._media_server.volume_down(zone=self._target_zone)
+        self._set_optimistic(volume=volume)
 
     @cmd
     async def async_set_volume_level(self, volume: float) -> None:
         """Set volume level, range 0..1."""
+        self._set_optimistic(volume=volume)
         await self._media_server.set_volume_level(volume, zone=self._target_zone)
 
     @cmd
     async def async_mute_volume(self, mute: bool) -> None:
         """Mute (true) or unmute (false) media player."""
+        self._set_optimistic(muted=mute)
         await self._media_server.mute(mute, zone=self._target_zone)
 
     @cmd
     async def async_media_play_pause(self) -> None:
         """Pause media on media player."""
+        if self._playback_info and self._playback_info.state in (
+            PlaybackState.PLAYING,
+            PlaybackState.PAUSED,
+        ):
+            self._set_optimistic_state(
+                PlaybackState.PAUSED
+                if self._playback_info.state == PlaybackState.PLAYING
+                else PlaybackState.PLAYING
+            )
         await self._media_server.play_pause(zone=self._target_zone)
 
     @cmd
     async def async_media_play(self) -> None:
         """Play media."""
+        if self._playback_info and self._playback_info.state == PlaybackState.PAUSED:
+            self._set_optimistic_state(PlaybackState.PLAYING)
         await self._media_server.play(zone=self._target_zone)
 
     @cmd
     async def async_media_pause(self) -> None:
         """Pause the media player."""
+        if self._playback_info and self._playback_info.state == PlaybackState.PLAYING:
+            self._set_optimistic_state(PlaybackState.PAUSED)
         await self._media_server.pause(zone=self._target_zone)
 
     @cmd
     async def async_media_stop(self) -> None:
         """Stop the media player."""
+        self._set_optimistic_state(PlaybackState.STOPPED)
         await self._media_server.stop(zone=self._target_zone)
 
     @cmd
@@ -494,9 +620,13 @@ class JRiverMediaPlayer(MediaServerEntity, MediaPlayerEntity):
     @cmd
     async def async_media_seek(self, position: float) -> None:
         """Send seek command to a position specified in seconds."""
-        await self._media_server.media_seek(
-            int(position * 1000), zone=self._target_zone
-        )
+        position_ms = int(position * 1000)
+        if self._position:
+            self._set_optimistic(
+                PlaybackPosition(position_ms, dt_util.utcnow(), self._position.playing),
+                position_ms=position_ms,
+            )
+        await self._media_server.media_seek(position_ms, zone=self._target_zone)
 
     @cmd
     async def async_play_media(
@@ -599,9 +729,16 @@ class JRiverMediaPlayer(MediaServerEntity, MediaPlayerEntity):
     async def async_adjust_volume(self, delta: int):
         """Adjust volume by the given amount."""
         if delta > 0:
-            await self._media_server.volume_up(delta / 100, zone=self._target_zone)
+            volume = await self._media_server.volume_up(
+                delta / 100, zone=self._target_zone
+            )
         elif delta < 0:
-            await self._media_server.volume_down(delta / 100, zone=self._target_zone)
+            volume = await self._media_server.volume_down(
+                delta / 100, zone=self._target_zone
+            )
+        else:
+            return
+        self._set_optimistic(volume=volume)
 
     async def async_browse_media(
         self,
@@ -616,7 +753,10 @@ class JRiverMediaPlayer(MediaServerEntity, MediaPlayerEntity):
 
         if not media_content_type:
             card, _ = await browse_nodes(
-                self.hass, self._media_server, self._browse_paths
+                self.hass,
+                self._media_server,
+                self._browse_paths,
+                cache=self.coordinator.browse_cache,
             )
             return card
 
@@ -633,6 +773,7 @@ class JRiverMediaPlayer(MediaServerEntity, MediaPlayerEntity):
                 self._browse_paths,
                 parent_content_type=media_content_type,
                 parent_id=media_content_id,
+                cache=self.coordinator.browse_cache,
             )
             if has_mc_nodes:
                 return card
@@ -18,6 +18,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import MediaServerUpdateCoordinator
 from .const import DATA_COORDINATOR, DATA_MEDIA_SERVER, DATA_SERVER_NAME, DOMAIN
+from .coordinator import CONTEXT_VIEW_MODE
 from .entity import MediaServerEntity, cmd
 
 _LOGGER = logging.getLogger(__name__)
@@ -88,7 +89,7 @@ class JRiverRemote(MediaServerEntity, RemoteEntity):
         hass: HomeAssistant,
     ) -> None:
         """Initialize the MediaServer entity."""
-        super().__init__(coordinator, uid, name)
+        super().__init__(coordinator, uid, name, (CONTEXT_VIEW_MODE,))
         self._media_server: MediaServer = media_server
         self._key_command_names = [e.name for e in KeyCommand]
         self._key_command_values = [e.value for e in KeyCommand]
@@ -0,0 +1,134 @@
+"""Schedules the polls of every JRiver media server."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import datetime as dt
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import MAX_CONCURRENT_REQUESTS, POLL_INTERVAL_ACTIVE
+
+if TYPE_CHECKING:
+    from .coordinator import MediaServerUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _Slot:
+    """The poll state of a coordinator."""
+
+    coordinator: MediaServerUpdateCoordinator
+    last_started: float | None = None
+    task: asyncio.Task | None = None
+    lagging: bool = False
+
+    @property
+    def name(self) -> str:
+        entry = self.coordinator.config_entry
+        return entry.title if entry else self.coordinator.name
+
+
+class PollScheduler:
+    """Polls every registered coordinator from a single timer.
+
+    The coordinators take turns in evenly spaced slots of POLL_INTERVAL_ACTIVE so
+    polls for different servers do not start at the same moment. A coordinator is
+    polled in its slot once its poll interval has elapsed since the last poll.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._slots: list[_Slot] = []
+        self._next_slot: int = 0
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        # shared by the polls of every server
+        self.request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    @callback
+    def async_register(
+        self, coordinator: MediaServerUpdateCoordinator
+    ) -> CALLBACK_TYPE:
+        """Start polling the coordinator, returns a callback to stop polling it."""
+        slot = _Slot(coordinator, last_started=self._hass.loop.time())
+        self._slots.append(slot)
+        self._restart_timer()
+
+        @callback
+        def _unregister() -> None:
+            self._slots.remove(slot)
+            if slot.task:
+                slot.task.cancel()
+            self._restart_timer()
+
+        return _unregister
+
+    def _restart_timer(self) -> None:
+        """Spread the slots evenly across the active poll interval."""
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._next_slot = 0
+        if not self._slots:
+            return
+        self._unsub_timer = async_track_time_interval(
+            self._hass,
+            self._async_poll_next,
+            dt.timedelta(seconds=POLL_INTERVAL_ACTIVE / len(self._slots)),
+            name="jriver poll scheduler",
+            cancel_on_shutdown=True,
+        )
+
+    @callback
+    def _async_poll_next(self, _now: dt.datetime) -> None:
+        slot = self._slots[self._next_slot]
+        self._next_slot = (self._next_slot + 1) % len(self._slots)
+
+        now = self._hass.loop.time()
+        due_at = now
+        if slot.last_started is not None:
+            due_at = (
+                slot.last_started + slot.coordinator.poll_interval.total_seconds()
+            )
+            # each slot comes round once per active interval, allow for timer jitter
+            if now < due_at - POLL_INTERVAL_ACTIVE / 2:
+                return
+
+        if slot.task and not slot.task.done():
+            # the previous poll overran into this slot
+            self._report_lag(slot, now - due_at)
+            return
+
+        if slot.lagging:
+            _LOGGER.info("[%s] Polls are back on schedule", slot.name)
+            slot.lagging = False
+
+        slot.last_started = now
+        name = f"jriver poll {slot.name}"
+        if entry := slot.coordinator.config_entry:
+            slot.task = entry.async_create_background_task(
+                self._hass, slot.coordinator.async_refresh(), name
+            )
+        else:
+            slot.task = self._hass.async_create_background_task(
+                slot.coordinator.async_refresh(), name
+            )
+
+    def _report_lag(self, slot: _Slot, lag: float) -> None:
+        if slot.lagging:
+            _LOGGER.debug("[%s] Poll is %.1fs behind schedule", slot.name, lag)
+            return
+        slot.lagging = True
+        _LOGGER.warning(
+            "[%s] Poll is %.1fs behind schedule, %d servers are sharing %d requests",
+            slot.name,
+            lag,
+            len(self._slots),
+            MAX_CONCURRENT_REQUESTS,
+        )
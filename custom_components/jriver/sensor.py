@@ -6,8 +6,6 @@ from collections.abc import Mapping
 import logging
 from typing import Any
 
-from hamcws import MediaServer
-
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
@@ -17,10 +15,11 @@ from . import MediaServerUpdateCoordinator
 from .const import (
     DATA_COORDINATOR,
     DATA_EXTRA_FIELDS,
-    DATA_MEDIA_SERVER,
     DATA_SERVER_NAME,
+    DATA_ZONES,
     DOMAIN,
 )
+from .coordinator import CONTEXT_ACTIVE_ZONE, zone_context
 from .entity import MediaServerEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -35,8 +34,9 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][config_entry.entry_id]
     extra_fields = data[DATA_EXTRA_FIELDS]
     name = data[DATA_SERVER_NAME]
-    ms: MediaServer = data[DATA_MEDIA_SERVER]
     uid_prefix = config_entry.unique_id or config_entry.entry_id
+    # zones which were not selected are not polled unless their sensor is enabled
+    device_zones = data[DATA_ZONES]
 
     entities = [
                    JRiverActiveZoneSensor(
@@ -49,8 +49,9 @@ async def async_setup_entry(
                        f"{name} - {z} (Playing Now)",
                        z.name,
                        extra_fields,
+                       enabled_default=not device_zones or z.name in device_zones,
                    )
-                   for z in await ms.get_zones()
+                   for z in data[DATA_COORDINATOR].data.zones
                ]
 
     async_add_entities(entities)
@@ -61,6 +62,15 @@ class JRiverActiveZoneSensor(MediaServerEntity, SensorEntity):
 
     _attr_name = None
 
+    def __init__(
+            self,
+            coordinator: MediaServerUpdateCoordinator,
+            unique_id: str,
+            name: str,
+    ) -> None:
+        """Init the sensor."""
+        super().__init__(coordinator, unique_id, name, (CONTEXT_ACTIVE_ZONE,))
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
@@ -85,9 +95,16 @@ class JRiverPlayingNowSensor(MediaServerEntity, SensorEntity):
             name: str,
             zone_name: str,
             extra_fields: list[str],
+            enabled_default: bool = True,
     ) -> None:
         """Init the sensor."""
-        super().__init__(coordinator, unique_id, name)
+        super().__init__(
+            coordinator,
+            unique_id,
+            name,
+            (zone_context(zone_name), CONTEXT_ACTIVE_ZONE),
+        )
+        self._attr_entity_registry_enabled_default = enabled_default
         self._zone_name = zone_name
         self._extra_fields = extra_fields
 
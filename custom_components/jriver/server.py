@@ -0,0 +1,98 @@
+"""A MediaServer which shares identical requests that are in flight."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Concatenate, ParamSpec, TypeVar
+
+from hamcws import MediaServer, MediaServerConnection, Zone
+
+_T = TypeVar("_T")
+_P = ParamSpec("_P")
+
+
+def _freeze(value: Any) -> Any:
+    """Convert an argument to a hashable value."""
+    if isinstance(value, Zone):
+        return Zone, value.id, value.name
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+@dataclass
+class _Flight:
+    """A request in flight and the number of callers waiting for it."""
+
+    task: asyncio.Task
+    waiters: int = 0
+
+
+def _single_flight(
+    func: Callable[Concatenate[MediaServer, _P], Coroutine[Any, Any, _T]],
+) -> Callable[Concatenate[SingleFlightMediaServer, _P], Awaitable[_T]]:
+    """Share the result of the request with concurrent callers with the same args."""
+
+    @wraps(func)
+    async def wrapper(
+        obj: SingleFlightMediaServer, *args: _P.args, **kwargs: _P.kwargs
+    ) -> _T:
+        key = (func.__name__, _freeze(args), _freeze(kwargs))
+        return await obj._join(key, lambda: func(obj, *args, **kwargs))
+
+    return wrapper
+
+
+class SingleFlightMediaServer(MediaServer):
+    """A MediaServer which only sends one of any identical concurrent reads.
+
+    Callers asking the same question while a request is in flight wait for that
+    request, the result is shared so must be treated as read only. The request is
+    cancelled if every caller waiting for it is cancelled. Commands are always
+    sent.
+    """
+
+    def __init__(self, connection: MediaServerConnection) -> None:
+        """Initialize."""
+        super().__init__(connection)
+        self._in_flight: dict[Any, _Flight] = {}
+
+    async def _join(
+        self, key: Any, request: Callable[[], Coroutine[Any, Any, _T]]
+    ) -> _T:
+        flight = self._in_flight.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(request()))
+            self._in_flight[key] = flight
+
+            def _landed(_: asyncio.Task) -> None:
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+
+            flight.task.add_done_callback(_landed)
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # nobody wants the answer any more, so don't share the cancelled task
+                flight.task.cancel()
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+
+    alive = _single_flight(MediaServer.alive)
+    get_auth_token = _single_flight(MediaServer.get_auth_token)
+    get_zones = _single_flight(MediaServer.get_zones)
+    get_library_fields = _single_flight(MediaServer.get_library_fields)
+    get_playback_info = _single_flight(MediaServer.get_playback_info)
+    get_view_mode = _single_flight(MediaServer.get_view_mode)
+    get_browse_rules = _single_flight(MediaServer.get_browse_rules)
+    browse_children = _single_flight(MediaServer.browse_children)
+    browse_files = _single_flight(MediaServer.browse_files)
@@ -0,0 +1,68 @@
+"""Test the JRiver Media Center browse cache."""
+from unittest.mock import AsyncMock
+
+from freezegun.api import FrozenDateTimeFactory
+
+from custom_components.jriver.browse_cache import BrowseCache, _approx_size
+
+
+def _node(name: str) -> dict[str, str]:
+    return {"Name": name, "Key": name}
+
+
+def test_entries_expire(freezer: FrozenDateTimeFactory) -> None:
+    """Test entries are only returned until the ttl has passed."""
+    cache = BrowseCache(ttl=10)
+    cache.put(1, _node("a"))
+
+    freezer.tick(9)
+    assert cache.get(1) == _node("a")
+
+    freezer.tick(1)
+    assert cache.get(1) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_evicted() -> None:
+    """Test the least recently used entry is evicted when the cache is full."""
+    cache = BrowseCache(max_entries=2)
+    cache.put(1, _node("a"))
+    cache.put(2, _node("b"))
+    assert cache.get(1) is not None
+
+    cache.put(3, _node("c"))
+
+    assert len(cache) == 2
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+    assert cache.get(3) is not None
+
+
+def test_size_limited() -> None:
+    """Test the cache stays within max_bytes and oversize values are not cached."""
+    big = {str(i): _node(str(i)) for i in range(50)}
+    cache = BrowseCache(max_bytes=_approx_size(big) * 3 // 2)
+    cache.put(1, big)
+    cache.put(2, big)
+    assert len(cache) == 1
+    assert cache.get(1) is None
+    assert cache.get(2) is big
+
+    cache.put(3, {str(i): _node(str(i)) for i in range(100)})
+    assert cache.get(3) is None
+    assert cache.get(2) is big
+
+
+async def test_fetched_once() -> None:
+    """Test the value is fetched on a miss and then served from the cache."""
+    cache = BrowseCache()
+    fetch = AsyncMock(return_value=_node("a"))
+
+    assert await cache.async_get_or_fetch(1, fetch) == _node("a")
+    assert await cache.async_get_or_fetch(1, fetch) == _node("a")
+    fetch.assert_awaited_once()
+
+    cache.clear()
+    assert len(cache) == 0
+    await cache.async_get_or_fetch(1, fetch)
+    assert fetch.await_count == 2
@@ -0,0 +1,235 @@
+"""Test the JRiver Media Center media browser."""
+from itertools import product
+from unittest.mock import AsyncMock
+
+from freezegun.api import FrozenDateTimeFactory
+from hamcws import (
+    BrowsePath,
+    BrowseRule,
+    MediaServer,
+    convert_browse_rules,
+    parse_browse_paths_from_text,
+    search_for_path,
+)
+import pytest
+
+from custom_components.jriver.browse_cache import BrowseCache
+from custom_components.jriver.browse_media import BrowsePathIndex, browse_nodes
+from custom_components.jriver.const import BROWSE_PAGE_SIZE, DEFAULT_BROWSE_PATHS
+from homeassistant.components.media_player import BrowseError
+from homeassistant.core import HomeAssistant
+
+ALBUMS = "Audio > Album"
+
+
+def _rule_paths() -> list[BrowsePath]:
+    return convert_browse_rules(
+        [
+            BrowseRule("Audio", "", "[Media Type]=[Audio]"),
+            BrowseRule("Audio\\Artist", "Album Artist (auto)\\Album", ""),
+            BrowseRule("Audio\\Album", "Album", ""),
+            BrowseRule("Audio\\Recent", "", ""),
+            BrowseRule("Video", "", "[Media Type]=[Video]"),
+            BrowseRule("Video\\Shows", "Series\\Season", "[Media Sub Type]=[TV Show]"),
+            BrowseRule("Video\\Movies", "", "[Media Sub Type]=[Movie]"),
+        ]
+    )
+
+
+def _names(paths: list[BrowsePath]) -> set[str]:
+    names: set[str] = set()
+    for path in paths:
+        names.add(path.name)
+        names |= _names(path.children)
+    return names
+
+
+@pytest.mark.parametrize(
+    "paths",
+    [parse_browse_paths_from_text(DEFAULT_BROWSE_PATHS), _rule_paths()],
+    ids=["text", "rules"],
+)
+def test_find_matches_search_for_path(paths: list[BrowsePath]) -> None:
+    """Test the index finds the same path as a search for every path 4 deep."""
+    index = BrowsePathIndex(paths)
+    # the names of the nodes in the paths plus a value of a field
+    tokens = sorted(_names(paths) | {"Some Value"})
+
+    for depth in range(1, 5):
+        for target in product(tokens, repeat=depth):
+            assert index.find(target) is search_for_path(paths, list(target)), target
+
+
+def test_classification_remembered() -> None:
+    """Test each path is only classified once."""
+    index = BrowsePathIndex(_rule_paths())
+    path = index.find(["Video", "Shows", "Some Show", "Season 1"])
+    assert path is not None
+
+    classification = index.classify(path)
+
+    assert classification is not None
+    assert index.classify(path) is classification
+    assert list(index._classifications) == [id(path)]
+
+
+def _media_server(
+    nodes: dict[str, str] | None = None, files: list[dict[str, str]] | None = None
+) -> MediaServer:
+    ms = AsyncMock(MediaServer)
+    ms.browse_children.return_value = nodes or {}
+    ms.browse_files.return_value = files or []
+    ms.get_browse_thumbnail_url.return_value = "http://thumbnail"
+    ms.get_file_image_url.return_value = "http://image"
+    return ms
+
+
+def _albums(count: int) -> dict[str, str]:
+    return {f"Album {i:03}": str(100 + i) for i in range(count)}
+
+
+async def test_children_paged(hass: HomeAssistant) -> None:
+    """Test large nodes are returned a page at a time."""
+    ms = _media_server(_albums(600))
+    index = BrowsePathIndex(parse_browse_paths_from_text(DEFAULT_BROWSE_PATHS))
+
+    media_id = f"N|2|{ALBUMS}"
+    pages = []
+    while media_id:
+        library_info, count = await browse_nodes(
+            hass, ms, index, parent_id=media_id, bucket_threshold=None
+        )
+        pages.append(library_info)
+        more = library_info.children[-1]
+        media_id = more.media_content_id if more.media_content_id[0] == "P" else None
+
+    assert [len(p.children) for p in pages] == [
+        BROWSE_PAGE_SIZE + 1,
+        BROWSE_PAGE_SIZE + 1,
+        100,
+    ]
+    assert count == 100
+    assert pages[0].children[0].media_content_id == f"N|100|{ALBUMS} > Album 000"
+    assert pages[0].children[-1].media_content_id == f"P|250|2|{ALBUMS}"
+    assert pages[0].children[-1].title == "More (251-500 of 600)"
+    assert pages[1].children[0].title == "Album 250"
+    assert pages[1].children[-1].media_content_id == f"P|500|2|{ALBUMS}"
+    assert pages[2].children[-1].title == "Album 599"
+    assert all(p.can_expand and not p.can_play for p in pages)
+
+
+async def test_files_paged(hass: HomeAssistant) -> None:
+    """Test nodes with many files are paged and a page cannot be played."""
+    files = [
+        {"Key": str(i), "Name": f"Track {i}", "Media Type": "Audio"} for i in range(300)
+    ]
+    ms = _media_server(files=files)
+    index = BrowsePathIndex(parse_browse_paths_from_text(DEFAULT_BROWSE_PATHS))
+
+    first, count = await browse_nodes(
+        hass, ms, index, parent_id=f"N|5|{ALBUMS} > Album 000"
+    )
+    assert count == BROWSE_PAGE_SIZE
+    assert first.can_play
+    more = first.children[-1]
+    assert more.media_content_id == f"P|250|5|{ALBUMS} > Album 000"
+    assert not more.can_play
+
+    second, count = await browse_nodes(
+        hass, ms, index, parent_id=more.media_content_id
+    )
+    assert count == len(second.children) == 50
+    assert second.children[0].media_content_id == "K|250"
+    assert not second.can_play
+
+
+async def test_children_bucketed(hass: HomeAssistant) -> None:
+    """Test the children of very large nodes are grouped by initial."""
+    nodes = _albums(600)
+    nodes |= {
+        "Zebra": "1",
+        "Émile": "2",
+        "etc": "3",
+        "1999": "4",
+        "[Live]": "5",
+    }
+    ms = _media_server(nodes)
+    index = BrowsePathIndex(parse_browse_paths_from_text(DEFAULT_BROWSE_PATHS))
+    cache = BrowseCache()
+
+    library_info, count = await browse_nodes(
+        hass, ms, index, parent_id=f"N|2|{ALBUMS}", cache=cache
+    )
+    assert [c.title for c in library_info.children] == [
+        "0-9 (1)",
+        "A (600)",
+        "E (2)",
+        "Z (1)",
+        "# (1)",
+    ]
+    assert count == 5
+    assert not library_info.can_play
+    bucket_a = library_info.children[1]
+    assert bucket_a.media_content_id == f"B|A|0|2|{ALBUMS}"
+
+    library_info, count = await browse_nodes(
+        hass, ms, index, parent_id=bucket_a.media_content_id, cache=cache
+    )
+    assert count == BROWSE_PAGE_SIZE
+    assert library_info.title == f"{ALBUMS} (A)"
+    assert not library_info.can_play
+    assert library_info.children[-1].media_content_id == f"B|A|250|2|{ALBUMS}"
+
+    library_info, count = await browse_nodes(
+        hass, ms, index, parent_id=f"B|E|0|2|{ALBUMS}", cache=cache
+    )
+    assert [c.title for c in library_info.children] == ["Émile", "etc"]
+    ms.browse_children.assert_awaited_once()
+
+
+async def test_missing_bucket(hass: HomeAssistant) -> None:
+    """Test browsing a bucket which no longer has any children."""
+    ms = _media_server(_albums(600))
+    index = BrowsePathIndex(parse_browse_paths_from_text(DEFAULT_BROWSE_PATHS))
+
+    with pytest.raises(BrowseError):
+        await browse_nodes(hass, ms, index, parent_id=f"B|Q|0|2|{ALBUMS}")
+    ms.browse_files.assert_not_called()
+
+
+async def test_bucket_of_empty_node(hass: HomeAssistant) -> None:
+    """Test browsing a bucket of a node which no longer has any children."""
+    ms = _media_server()
+    index = BrowsePathIndex(parse_browse_paths_from_text(DEFAULT_BROWSE_PATHS))
+
+    with pytest.raises(BrowseError):
+        await browse_nodes(hass, ms, index, parent_id=f"B|A|0|2|{ALBUMS}")
+    ms.browse_files.assert_not_called()
+
+
+async def test_buckets_regrouped_with_children(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the buckets are grouped again when the children are fetched again."""
+    ms = _media_server(_albums(600))
+    index = BrowsePathIndex(parse_browse_paths_from_text(DEFAULT_BROWSE_PATHS))
+    cache = BrowseCache(ttl=10)
+
+    # the children are cached before the buckets
+    await browse_nodes(
+        hass, ms, index, parent_id=f"N|2|{ALBUMS}", cache=cache, bucket_threshold=None
+    )
+    freezer.tick(5)
+    await browse_nodes(hass, ms, index, parent_id=f"N|2|{ALBUMS}", cache=cache)
+
+    # the children expire while the buckets are still cached
+    freezer.tick(5)
+    ms.browse_children.return_value = {"Yak": "1", "Zebra": "2"}
+    library_info, _ = await browse_nodes(
+        hass, ms, index, parent_id=f"N|2|{ALBUMS}", cache=cache, bucket_threshold=1
+    )
+    assert [c.title for c in library_info.children] == ["Y (1)", "Z (1)"]
+    assert ms.browse_children.await_count == 2
+
+    with pytest.raises(BrowseError):
+        await browse_nodes(hass, ms, index, parent_id=f"B|A|0|2|{ALBUMS}", cache=cache)
@@ -0,0 +1,124 @@
+"""Test the JRiver Media Center cached server data."""
+import json
+from typing import Any
+
+from hamcws import (
+    BrowsePath,
+    MediaServer,
+    MediaServerInfo,
+    MediaType as mc_MediaType,
+    ViewMode,
+    Zone,
+    parse_browse_paths_from_text,
+)
+
+from custom_components.jriver.cache import CachedServer, create_store
+from custom_components.jriver.const import DEFAULT_BROWSE_PATHS
+from custom_components.jriver.coordinator import MediaServerUpdateCoordinator
+from homeassistant.components.media_player import MediaType
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+SERVER_INFO = {"ProgramVersion": "32.0.10", "FriendlyName": "test", "Platform": "Linux"}
+
+
+def _cached_server() -> CachedServer:
+    zone_content = {
+        "ZoneID0": "10000",
+        "ZoneName0": "Player",
+        "ZoneGUID0": "{abc}",
+        "ZoneDLNA0": "0",
+        "ZoneID1": "10001",
+        "ZoneName1": "Study",
+        "ZoneGUID1": "{def}",
+        "ZoneDLNA1": "1",
+    }
+    browse_paths = parse_browse_paths_from_text(DEFAULT_BROWSE_PATHS)
+    playlist_path = BrowsePath("Playlists")
+    playlist_path.media_types.append(MediaType.PLAYLIST)
+    browse_paths.append(playlist_path)
+    return CachedServer(
+        server_info=MediaServerInfo(SERVER_INFO),
+        zones=[Zone(zone_content, 0, 10001), Zone(zone_content, 1, 10001)],
+        view_mode=ViewMode.STANDARD,
+        browse_paths=browse_paths,
+        last_path_refresh=dt_util.utcnow(),
+    )
+
+
+def _assert_same_path(actual: BrowsePath, expected: BrowsePath) -> None:
+    assert actual.name == expected.name
+    assert actual.is_field == expected.is_field
+    assert actual.media_types == expected.media_types
+    assert actual.media_sub_types == expected.media_sub_types
+    assert len(actual.children) == len(expected.children)
+    for child, expected_child in zip(actual.children, expected.children):
+        assert child.parent is actual
+        _assert_same_path(child, expected_child)
+
+
+def _round_trip(data: dict[str, Any]) -> dict[str, Any]:
+    return json.loads(json.dumps(data))
+
+
+def test_round_trip() -> None:
+    """Test the cached data is restored as saved."""
+    cached = _cached_server()
+
+    loaded = CachedServer.from_dict(_round_trip(cached.as_dict()))
+
+    assert loaded.server_info == cached.server_info
+    assert [(z.id, z.name, z.guid, z.is_dlna, z.active) for z in loaded.zones] == [
+        (z.id, z.name, z.guid, z.is_dlna, z.active) for z in cached.zones
+    ]
+    assert loaded.view_mode == ViewMode.STANDARD
+    assert loaded.last_path_refresh == cached.last_path_refresh
+    assert len(loaded.browse_paths) == len(cached.browse_paths)
+    for path, expected in zip(loaded.browse_paths, cached.browse_paths):
+        assert path.parent is None
+        _assert_same_path(path, expected)
+    assert loaded.browse_paths[-1].media_types == [MediaType.PLAYLIST]
+    assert loaded.browse_paths[0].media_types == [mc_MediaType.AUDIO]
+
+
+def test_paths_ignored_after_upgrade() -> None:
+    """Test the paths are not restored when the server version has changed."""
+    data = _round_trip(_cached_server().as_dict())
+    data["server_info"]["ProgramVersion"] = "33.0.1"
+
+    loaded = CachedServer.from_dict(data)
+
+    assert loaded.browse_paths is None
+    assert loaded.last_path_refresh is None
+    assert len(loaded.zones) == 2
+
+
+async def test_coordinator_starts_from_cache(
+    hass: HomeAssistant, media_server: MediaServer
+) -> None:
+    """Test the coordinator starts from the saved data."""
+    store = create_store(hass, "test")
+    await store.async_save(_cached_server().as_dict())
+    coordinator = MediaServerUpdateCoordinator(hass, media_server, None, store=store)
+
+    assert await coordinator.async_load_cache()
+
+    assert coordinator.data.server_info.version == "32.0.10"
+    assert coordinator.data.capabilities.can_refresh_paths
+    assert [z.name for z in coordinator.data.zones] == ["Player", "Study"]
+    assert coordinator.data.get_active_zone_name() == "Study"
+    assert coordinator.data.browse_paths[-1].name == "Playlists"
+    media_server.alive.assert_not_called()
+
+
+async def test_invalid_cache_ignored(
+    hass: HomeAssistant, media_server: MediaServer
+) -> None:
+    """Test a cold start when there is no saved data or it cannot be read."""
+    store = create_store(hass, "test")
+    coordinator = MediaServerUpdateCoordinator(hass, media_server, None, store=store)
+    assert not await coordinator.async_load_cache()
+
+    await store.async_save({"server_info": {}})
+    assert not await coordinator.async_load_cache()
+    assert coordinator.data.server_info is None
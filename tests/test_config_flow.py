@@ -21,9 +21,13 @@ from custom_components.jriver.coordinator import MediaServerData
 from homeassistant import config_entries
 from custom_components.jriver.const import (
     CONF_BROWSE_PATHS,
+    CONF_CONNECT_TIMEOUT,
+    CONF_DEDICATED_SESSION,
     CONF_DEVICE_PER_ZONE,
     CONF_DEVICE_ZONES,
     CONF_EXTRA_FIELDS,
+    CONF_POLL_TIMEOUT,
+    CONF_READ_TIMEOUT,
     CONF_USE_WOL,
     DOMAIN,
 )
@@ -649,4 +653,38 @@ async def test_reconfigure_options(
             result["flow_id"],
             user_input={CONF_EXTRA_FIELDS: []},
         )
+        assert result["type"] == FlowResultType.FORM
+        assert result["errors"] == {}
+        assert result["step_id"] == "connection"
+
+        # the poll timeout must be less than the total timeout
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={
+                CONF_CONNECT_TIMEOUT: 2,
+                CONF_READ_TIMEOUT: 4,
+                CONF_TIMEOUT: 8,
+                CONF_POLL_TIMEOUT: 8,
+                CONF_DEDICATED_SESSION: True,
+            },
+        )
+        assert result["type"] == FlowResultType.FORM
+        assert result["errors"] == {"base": "poll_timeout_too_long"}
+        assert result["step_id"] == "connection"
+
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={
+                CONF_CONNECT_TIMEOUT: 2,
+                CONF_READ_TIMEOUT: 4,
+                CONF_TIMEOUT: 8,
+                CONF_POLL_TIMEOUT: 3,
+                CONF_DEDICATED_SESSION: True,
+            },
+        )
         assert result["type"] == FlowResultType.CREATE_ENTRY
+        assert result["data"][CONF_CONNECT_TIMEOUT] == 2
+        assert result["data"][CONF_READ_TIMEOUT] == 4
+        assert result["data"][CONF_TIMEOUT] == 8
+        assert result["data"][CONF_POLL_TIMEOUT] == 3
+        assert result["data"][CONF_DEDICATED_SESSION] is True
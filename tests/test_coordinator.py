@@ -0,0 +1,540 @@
+"""Test the JRiver Media Center coordinator."""
+import asyncio
+import datetime as dt
+from unittest.mock import AsyncMock, PropertyMock
+
+from freezegun.api import FrozenDateTimeFactory
+from hamcws import (
+    BrowseRule,
+    CannotConnectError,
+    MediaServer,
+    MediaServerInfo,
+    PlaybackInfo,
+    PlaybackState,
+    ViewMode,
+    Zone,
+)
+import pytest
+
+from custom_components.jriver.const import (
+    OFFLINE_AFTER_FAILURES,
+    OFFLINE_PROBE_INTERVAL_MIN,
+    POLL_INTERVAL_ACTIVE,
+    POLL_ZONE_BUDGET,
+    POSITION_DRIFT_TOLERANCE_MS,
+    REFRESH_INTERVAL_PATHS,
+    RETRY_INTERVAL_PATHS,
+)
+from custom_components.jriver.coordinator import (
+    CONTEXT_ACTIVE_ZONE,
+    CONTEXT_BROWSE_PATHS,
+    CONTEXT_VIEW_MODE,
+    MediaServerUpdateCoordinator,
+    PlaybackPosition,
+    zone_context,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+ZONE_NAMES = ["Player", "Study"]
+
+
+def _zones(names: list[str], active: int) -> list[Zone]:
+    content = {"NumberZones": str(len(names)), "CurrentZoneID": str(active)}
+    for i, name in enumerate(names):
+        content[f"ZoneID{i}"] = str(i)
+        content[f"ZoneName{i}"] = name
+    return [Zone(content, i, active) for i in range(len(names))]
+
+
+def _playback_info(
+    zone_name: str,
+    state: int = 2,
+    position_ms: int = 1000,
+    name: str = "Song",
+    file_key: int = 1,
+) -> PlaybackInfo:
+    return PlaybackInfo(
+        {
+            "ZoneName": zone_name,
+            "State": str(state),
+            "FileKey": str(file_key),
+            "PositionMS": str(position_ms),
+            "Name": name,
+        },
+        [],
+    )
+
+
+@pytest.fixture
+def media_server() -> MediaServer:
+    """Mock a MediaServer with a stopped Player zone and a playing, active, Study zone.
+
+    The playback info returned for each zone is read from media_server.state and
+    the active zone index from media_server.active, the values of any extra fields
+    from media_server.extra_values.
+    """
+    ms = AsyncMock(MediaServer)
+    msi = MediaServerInfo({"ProgramVersion": "31.0.10", "FriendlyName": "test"})
+    ms.alive.return_value = msi
+    type(ms).media_server_info = PropertyMock(return_value=msi)
+    ms.active = 1
+    ms.zone_names = ZONE_NAMES
+    ms.get_zones.side_effect = lambda: _zones(ms.zone_names, ms.active)
+    ms.get_view_mode.return_value = ViewMode.STANDARD
+    ms.extra_values = {}
+    ms.state = {
+        "Player": _playback_info("Player", state=0, position_ms=0, name=""),
+        "Study": _playback_info("Study"),
+    }
+
+    async def _get_playback_info(
+        zone: Zone | None = None, extra_fields: list[str] | None = None
+    ) -> PlaybackInfo:
+        zone_name = zone.name if zone else ms.zone_names[ms.active]
+        info = ms.state[zone_name]
+        return PlaybackInfo(
+            {
+                "ZoneName": info.zone_name,
+                "State": str(info.state.value),
+                "FileKey": str(info.file_key),
+                "PositionMS": str(info.position_ms),
+                "Name": info.name,
+                **ms.extra_values,
+            },
+            extra_fields or [],
+        )
+
+    ms.get_playback_info.side_effect = _get_playback_info
+    return ms
+
+
+@pytest.fixture
+async def coordinator(hass: HomeAssistant, media_server: MediaServer):
+    """Create a coordinator which has completed its first refresh."""
+    coordinator = MediaServerUpdateCoordinator(hass, media_server, None)
+    await coordinator.async_refresh()
+    yield coordinator
+    await coordinator.async_shutdown()
+
+
+def test_position_extrapolated_while_playing() -> None:
+    """Test the position moves with time while playing and is frozen otherwise."""
+    now = dt_util.utcnow()
+    later = now + dt.timedelta(seconds=2.5)
+
+    assert PlaybackPosition(1000, now, True).predict(later) == 3500
+    assert PlaybackPosition(1000, now, False).predict(later) == 1000
+
+
+def test_position_resynced_on_drift() -> None:
+    """Test the position is only resynced when the server disagrees with it."""
+    now = dt_util.utcnow()
+    later = now + dt.timedelta(seconds=10)
+    position = PlaybackPosition(1000, now, True)
+
+    in_step = _playback_info("Study", position_ms=11000 + POSITION_DRIFT_TOLERANCE_MS)
+    assert position.sync(in_step, later) is position
+
+    for info in (
+        # seek
+        _playback_info("Study", position_ms=60000),
+        # stalled
+        _playback_info("Study", position_ms=10000 - POSITION_DRIFT_TOLERANCE_MS),
+        # paused
+        _playback_info("Study", state=1, position_ms=11000),
+    ):
+        synced = position.sync(info, later)
+        assert synced == PlaybackPosition(
+            info.position_ms, later, info.state == PlaybackState.PLAYING
+        )
+
+    paused = PlaybackPosition(1000, now, False)
+    assert paused.sync(_playback_info("Study", state=1), later) is paused
+
+
+async def test_listeners_only_updated_for_their_contexts(
+    coordinator: MediaServerUpdateCoordinator, media_server: MediaServer
+) -> None:
+    """Test listeners are only updated when their contexts change."""
+    updated: list[str] = []
+    for name, context in (
+        ("player", zone_context("Player")),
+        ("study", zone_context("Study")),
+        ("active", zone_context(None)),
+        ("active_zone", CONTEXT_ACTIVE_ZONE),
+        ("view_mode", CONTEXT_VIEW_MODE),
+    ):
+        coordinator.async_add_listener(
+            lambda name=name: updated.append(name), frozenset({context})
+        )
+
+    await coordinator.async_refresh()
+    assert updated == []
+
+    media_server.state["Study"] = _playback_info("Study", position_ms=2000)
+    await coordinator.async_refresh()
+    assert sorted(updated) == ["active", "study"]
+
+    updated.clear()
+    media_server.active = 0
+    await coordinator.async_refresh()
+    assert coordinator.data.get_active_zone_name() == "Player"
+    assert sorted(updated) == ["active", "active_zone"]
+
+    updated.clear()
+    media_server.get_view_mode.return_value = ViewMode.NO_UI
+    coordinator.async_command_sent()
+    await coordinator.async_refresh()
+    assert updated == ["view_mode"]
+
+
+async def test_listener_without_context_always_updated(
+    coordinator: MediaServerUpdateCoordinator,
+) -> None:
+    """Test a listener without a context is updated on every refresh."""
+    updated: list[None] = []
+    coordinator.async_add_listener(lambda: updated.append(None))
+
+    await coordinator.async_refresh()
+
+    assert updated == [None]
+
+
+async def test_only_subscribed_zones_polled(
+    coordinator: MediaServerUpdateCoordinator, media_server: MediaServer
+) -> None:
+    """Test only the active zone and zones with listeners are polled."""
+    assert set(coordinator.data.playback_info_by_zone) == {"Player", "Study"}
+
+    coordinator.async_add_listener(lambda: None, frozenset({CONTEXT_VIEW_MODE}))
+    await coordinator.async_refresh()
+    assert set(coordinator.data.playback_info_by_zone) == {"Study"}
+
+    coordinator.async_add_listener(lambda: None, frozenset({zone_context("Player")}))
+    await coordinator.async_refresh()
+    assert set(coordinator.data.playback_info_by_zone) == {"Player", "Study"}
+
+
+async def test_listener_without_context_polls_all_zones(
+    coordinator: MediaServerUpdateCoordinator,
+) -> None:
+    """Test every zone is polled while a listener without a context is registered."""
+    coordinator.async_add_listener(lambda: None, frozenset({CONTEXT_VIEW_MODE}))
+    remove_listener = coordinator.async_add_listener(lambda: None)
+    await coordinator.async_refresh()
+    assert set(coordinator.data.playback_info_by_zone) == {"Player", "Study"}
+
+    remove_listener()
+    await coordinator.async_refresh()
+    assert set(coordinator.data.playback_info_by_zone) == {"Study"}
+
+
+async def test_idle_zones_polled_round_robin(
+    hass: HomeAssistant, media_server: MediaServer
+) -> None:
+    """Test idle zones take turns in the zone budget left by the busy zones."""
+    names = [f"Zone {i}" for i in range(8)]
+    media_server.zone_names = names
+    media_server.active = 0
+    media_server.state = {
+        name: _playback_info(name, state=2 if name == "Zone 3" else 0) for name in names
+    }
+    coordinator = MediaServerUpdateCoordinator(hass, media_server, None)
+    await coordinator.async_refresh()
+    assert media_server.get_playback_info.call_count == len(names)
+    coordinator.async_add_listener(
+        lambda: None, frozenset(zone_context(name) for name in names)
+    )
+
+    polled: set[str] = set()
+    for _ in range(4):
+        media_server.get_playback_info.reset_mock()
+        await coordinator.async_refresh()
+        zones = [
+            (c.args[0].name if c.args[0] else "Zone 0")
+            for c in media_server.get_playback_info.call_args_list
+        ]
+        assert len(zones) == POLL_ZONE_BUDGET
+        # the active and the playing zones are polled every time
+        assert {"Zone 0", "Zone 3"} <= set(zones)
+        assert len(coordinator.data.playback_info_by_zone) == len(names)
+        polled.update(zones)
+
+    assert polled == set(names)
+    await coordinator.async_shutdown()
+
+
+async def test_extra_fields_only_fetched_on_change(
+    hass: HomeAssistant, media_server: MediaServer
+) -> None:
+    """Test extra fields are reused until the file or the playback state changes."""
+
+    def _full_fetches() -> int:
+        return sum(
+            1
+            for c in media_server.get_playback_info.call_args_list
+            if c.kwargs.get("extra_fields")
+        )
+
+    media_server.extra_values = {"Genre": "Jazz"}
+    coordinator = MediaServerUpdateCoordinator(hass, media_server, ["Genre"])
+    await coordinator.async_refresh()
+    assert _full_fetches() == 2
+    assert coordinator.data.get_playback_info("Study").extra_fields == {
+        "Genre": "Jazz"
+    }
+
+    # only the position moved, the extra fields are copied from the last info
+    media_server.get_playback_info.reset_mock()
+    media_server.extra_values = {"Genre": "Rock"}
+    media_server.state["Study"] = _playback_info("Study", position_ms=5000)
+    await coordinator.async_refresh()
+    assert media_server.get_playback_info.call_count == 2
+    assert _full_fetches() == 0
+    study = coordinator.data.get_playback_info("Study")
+    assert study.position_ms == 5000
+    assert study.extra_fields == {"Genre": "Jazz"}
+
+    # a new track is fetched in full
+    media_server.get_playback_info.reset_mock()
+    media_server.state["Study"] = _playback_info("Study", name="Next", file_key=2)
+    await coordinator.async_refresh()
+    assert media_server.get_playback_info.call_count == 3
+    assert _full_fetches() == 1
+    assert coordinator.data.get_playback_info("Study").extra_fields == {
+        "Genre": "Rock"
+    }
+
+    # as is a change of playback state
+    media_server.get_playback_info.reset_mock()
+    media_server.state["Player"] = _playback_info("Player", name="")
+    await coordinator.async_refresh()
+    assert _full_fetches() == 1
+    assert coordinator.data.get_playback_info("Player").extra_fields == {
+        "Genre": "Rock"
+    }
+    await coordinator.async_shutdown()
+
+
+async def test_failing_zone_backs_off(
+    coordinator: MediaServerUpdateCoordinator, media_server: MediaServer
+) -> None:
+    """Test a failing zone keeps its last state and is retried later."""
+    get_playback_info = media_server.get_playback_info.side_effect
+
+    async def _fail_player(zone: Zone | None = None, **kwargs) -> PlaybackInfo:
+        if zone and zone.name == "Player":
+            raise CannotConnectError()
+        return await get_playback_info(zone, **kwargs)
+
+    media_server.get_playback_info.side_effect = _fail_player
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.data.stale_zones == {"Player"}
+    assert coordinator.data.is_stale("Player")
+    assert coordinator.data.get_playback_info("Player") is not None
+
+    media_server.get_playback_info.reset_mock()
+    await coordinator.async_refresh()
+    # only the active zone, Player is waiting to be retried
+    assert media_server.get_playback_info.call_count == 1
+
+    media_server.get_playback_info.side_effect = CannotConnectError()
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+    media_server.get_playback_info.side_effect = get_playback_info
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.data.stale_zones == frozenset()
+
+
+async def test_slow_zone_does_not_delay_poll(
+    hass: HomeAssistant, media_server: MediaServer
+) -> None:
+    """Test a zone which misses the poll deadline is treated as a failed zone."""
+    coordinator = MediaServerUpdateCoordinator(
+        hass, media_server, None, poll_timeout=0.2
+    )
+    await coordinator.async_refresh()
+    get_playback_info = media_server.get_playback_info.side_effect
+
+    async def _slow_player(zone: Zone | None = None, **kwargs) -> PlaybackInfo:
+        if zone and zone.name == "Player":
+            await asyncio.sleep(10)
+        return await get_playback_info(zone, **kwargs)
+
+    media_server.get_playback_info.side_effect = _slow_player
+    started = hass.loop.time()
+    await coordinator.async_refresh()
+
+    assert hass.loop.time() - started < 1
+    assert coordinator.last_update_success
+    assert coordinator.data.stale_zones == {"Player"}
+    await coordinator.async_shutdown()
+
+
+async def test_unreachable_server_only_probed(
+    coordinator: MediaServerUpdateCoordinator, media_server: MediaServer
+) -> None:
+    """Test only alive is called, less and less often, while the server is down."""
+    get_playback_info = media_server.get_playback_info.side_effect
+    media_server.alive.side_effect = CannotConnectError()
+    media_server.get_playback_info.side_effect = CannotConnectError()
+    for _ in range(OFFLINE_AFTER_FAILURES):
+        await coordinator.async_refresh()
+    assert coordinator.poll_interval == dt.timedelta(
+        seconds=OFFLINE_PROBE_INTERVAL_MIN
+    )
+
+    media_server.get_playback_info.reset_mock()
+    await coordinator.async_refresh()
+    media_server.get_playback_info.assert_not_called()
+    assert coordinator.poll_interval == dt.timedelta(
+        seconds=OFFLINE_PROBE_INTERVAL_MIN * 2
+    )
+
+    media_server.alive.side_effect = None
+    media_server.get_playback_info.side_effect = get_playback_info
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.poll_interval == dt.timedelta(seconds=POLL_INTERVAL_ACTIVE)
+
+
+async def test_wake_requested_polls_fully(
+    coordinator: MediaServerUpdateCoordinator, media_server: MediaServer
+) -> None:
+    """Test a wake request polls actively again straight away."""
+    media_server.alive.side_effect = CannotConnectError()
+    media_server.get_playback_info.side_effect = CannotConnectError()
+    for _ in range(OFFLINE_AFTER_FAILURES):
+        await coordinator.async_refresh()
+
+    coordinator.async_wake_requested()
+
+    assert coordinator.poll_interval == dt.timedelta(seconds=POLL_INTERVAL_ACTIVE)
+
+
+async def test_waiting_for_request_slot_not_a_failure(
+    hass: HomeAssistant, media_server: MediaServer
+) -> None:
+    """Test time spent waiting for other servers to free a slot is not a timeout."""
+    request_slots = asyncio.Semaphore(1)
+    coordinator = MediaServerUpdateCoordinator(
+        hass, media_server, None, poll_timeout=0.2, request_slots=request_slots
+    )
+    await request_slots.acquire()
+    refresh = hass.async_create_task(coordinator.async_refresh())
+    await asyncio.sleep(0.4)
+    media_server.alive.assert_not_called()
+
+    request_slots.release()
+    await refresh
+
+    assert coordinator.last_update_success
+    assert coordinator.poll_interval == dt.timedelta(seconds=POLL_INTERVAL_ACTIVE)
+    await coordinator.async_shutdown()
+
+
+async def test_polls_do_not_overlap(
+    coordinator: MediaServerUpdateCoordinator, media_server: MediaServer
+) -> None:
+    """Test a refresh waits for the poll in progress, e.g. after a warm start."""
+    get_playback_info = media_server.get_playback_info.side_effect
+    in_poll = 0
+    max_in_poll = 0
+
+    async def _slow_playback_info(*args, **kwargs) -> PlaybackInfo:
+        nonlocal in_poll, max_in_poll
+        in_poll += 1
+        max_in_poll = max(max_in_poll, in_poll)
+        await asyncio.sleep(0.05)
+        in_poll -= 1
+        return await get_playback_info(*args, **kwargs)
+
+    media_server.get_playback_info.side_effect = _slow_playback_info
+    coordinator.async_add_listener(lambda: None, frozenset({zone_context(None)}))
+    media_server.get_playback_info.reset_mock()
+
+    await asyncio.gather(coordinator.async_refresh(), coordinator.async_refresh())
+
+    assert max_in_poll == 1
+    assert media_server.get_playback_info.call_count == 2
+    assert coordinator.last_update_success
+
+
+@pytest.fixture
+def browse_rules_server(media_server: MediaServer) -> MediaServer:
+    """Mock a MediaServer which supports loading its browse paths.
+
+    Loading the paths waits until media_server.rules_released is set.
+    """
+    msi = MediaServerInfo({"ProgramVersion": "32.0.10", "FriendlyName": "test"})
+    media_server.alive.return_value = msi
+    type(media_server).media_server_info = PropertyMock(return_value=msi)
+    media_server.rules_released = asyncio.Event()
+
+    async def _get_browse_rules(*args, **kwargs) -> list[BrowseRule]:
+        await media_server.rules_released.wait()
+        return [BrowseRule("Audio", "", "[Media Type]=[Audio]")]
+
+    media_server.get_browse_rules.side_effect = _get_browse_rules
+    return media_server
+
+
+async def test_paths_loaded_in_background(
+    hass: HomeAssistant, browse_rules_server: MediaServer
+) -> None:
+    """Test polls do not wait for the browse paths and only one load runs."""
+    coordinator = MediaServerUpdateCoordinator(hass, browse_rules_server, None)
+    updated: list[None] = []
+    coordinator.async_add_listener(
+        lambda: updated.append(None), frozenset({CONTEXT_BROWSE_PATHS})
+    )
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.data.browse_paths is None
+    browse_rules_server.get_browse_rules.assert_called_once()
+
+    browse_rules_server.rules_released.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert [p.name for p in coordinator.data.browse_paths] == ["Audio", "Playlists"]
+    assert updated == [None]
+    await coordinator.async_shutdown()
+
+
+async def test_failed_path_reload_keeps_paths(
+    hass: HomeAssistant,
+    browse_rules_server: MediaServer,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the paths are kept when a reload fails and the reload is retried."""
+    browse_rules_server.rules_released.set()
+    coordinator = MediaServerUpdateCoordinator(hass, browse_rules_server, None)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    browse_paths = coordinator.data.browse_paths
+    assert browse_paths is not None
+
+    get_browse_rules = browse_rules_server.get_browse_rules.side_effect
+    browse_rules_server.get_browse_rules.side_effect = CannotConnectError()
+    freezer.tick(REFRESH_INTERVAL_PATHS)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert coordinator.data.browse_paths is browse_paths
+    assert browse_rules_server.get_browse_rules.call_count == 2
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert browse_rules_server.get_browse_rules.call_count == 2
+
+    browse_rules_server.get_browse_rules.side_effect = get_browse_rules
+    freezer.tick(RETRY_INTERVAL_PATHS)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert browse_rules_server.get_browse_rules.call_count == 3
+    assert coordinator.data.browse_paths is not browse_paths
+    await coordinator.async_shutdown()
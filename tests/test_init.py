@@ -0,0 +1,76 @@
+"""Test the JRiver Media Center integration setup."""
+from unittest.mock import AsyncMock, Mock, patch
+
+from aiohttp import ClientSession
+from hamcws import CannotConnectError, MediaServer
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.jriver import async_setup_entry
+from custom_components.jriver.const import (
+    CONF_BROWSE_PATHS,
+    CONF_DEDICATED_SESSION,
+    CONF_DEVICE_PER_ZONE,
+    CONF_DEVICE_ZONES,
+    CONF_EXTRA_FIELDS,
+    DATA_SCHEDULER,
+    DOMAIN,
+)
+from custom_components.jriver.scheduler import PollScheduler
+from homeassistant.const import (
+    CONF_API_KEY,
+    CONF_HOST,
+    CONF_NAME,
+    CONF_PASSWORD,
+    CONF_PORT,
+    CONF_SSL,
+    CONF_TIMEOUT,
+    CONF_USERNAME,
+    EVENT_HOMEASSISTANT_STOP,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
+
+
+async def test_failed_setup_closes_dedicated_session(hass: HomeAssistant) -> None:
+    """Test the dedicated session and listeners are released when setup fails."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_API_KEY: "",
+            CONF_NAME: "testme",
+            CONF_HOST: "localhost",
+            CONF_PORT: 12345,
+            CONF_USERNAME: "",
+            CONF_PASSWORD: "",
+            CONF_SSL: False,
+            CONF_TIMEOUT: 5,
+            CONF_BROWSE_PATHS: "a,b|c,d",
+            CONF_DEVICE_PER_ZONE: False,
+            CONF_DEVICE_ZONES: [],
+            CONF_EXTRA_FIELDS: [],
+        },
+        options={CONF_DEDICATED_SESSION: True},
+    )
+    config_entry.add_to_hass(hass)
+    hass.data[DATA_SCHEDULER] = PollScheduler(hass)
+    hass.data[DOMAIN] = {}
+    media_server = AsyncMock(MediaServer)
+    media_server.media_server_info = None
+    media_server.alive.side_effect = CannotConnectError()
+    session = Mock(ClientSession)
+    stop_listeners = hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_STOP, 0)
+
+    with (
+        patch("custom_components.jriver._create_session", return_value=session),
+        patch("custom_components.jriver._get_ms", return_value=media_server),
+        pytest.raises(ConfigEntryNotReady),
+    ):
+        await async_setup_entry(hass, config_entry)
+
+    session.close.assert_awaited_once()
+    media_server.close.assert_awaited_once()
+    assert config_entry.entry_id not in hass.data[DOMAIN]
+    assert (
+        hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_STOP, 0) == stop_listeners
+    )
@@ -0,0 +1,191 @@
+"""Test the JRiver Media Center media player."""
+import asyncio
+from unittest.mock import AsyncMock, Mock, PropertyMock
+
+from hamcws import (
+    CannotConnectError,
+    MediaServer,
+    MediaServerError,
+    MediaServerInfo,
+    PlaybackInfo,
+    ViewMode,
+    Zone,
+)
+import pytest
+
+from custom_components.jriver.coordinator import MediaServerUpdateCoordinator
+from custom_components.jriver.media_player import JRiverMediaPlayer
+from homeassistant.components.media_player import MediaPlayerState
+from homeassistant.core import HomeAssistant
+
+
+@pytest.fixture
+def media_server() -> MediaServer:
+    """Mock a MediaServer with a single zone playing at volume 0.3.
+
+    The playback info is read from media_server.values.
+    """
+    ms = AsyncMock(MediaServer)
+    msi = MediaServerInfo({"ProgramVersion": "31.0.10", "FriendlyName": "test"})
+    ms.alive.return_value = msi
+    type(ms).media_server_info = PropertyMock(return_value=msi)
+    ms.get_zones.side_effect = lambda: [
+        Zone({"ZoneID0": "0", "ZoneName0": "Player"}, 0, 0)
+    ]
+    ms.get_view_mode.return_value = ViewMode.STANDARD
+    ms.values = {
+        "ZoneName": "Player",
+        "State": "2",
+        "FileKey": "1",
+        "PositionMS": "1000",
+        "Name": "Song",
+        "Volume": "0.3",
+    }
+
+    async def _get_playback_info(
+        zone: Zone | None = None, extra_fields: list[str] | None = None
+    ) -> PlaybackInfo:
+        return PlaybackInfo(dict(ms.values), extra_fields or [])
+
+    ms.get_playback_info.side_effect = _get_playback_info
+    return ms
+
+
+@pytest.fixture
+async def coordinator(hass: HomeAssistant, media_server: MediaServer):
+    """Create a coordinator which has completed its first refresh."""
+    coordinator = MediaServerUpdateCoordinator(hass, media_server, None)
+    await coordinator.async_refresh()
+    yield coordinator
+    await coordinator.async_shutdown()
+
+
+@pytest.fixture
+async def player(
+    hass: HomeAssistant,
+    coordinator: MediaServerUpdateCoordinator,
+    media_server: MediaServer,
+):
+    """Create a media player for the active zone, counting the state writes."""
+    player = JRiverMediaPlayer(coordinator, media_server, "test", "test", [], [])
+    player.hass = hass
+    player.entity_id = "media_player.test"
+    player.async_write_ha_state = Mock()
+    await player.async_added_to_hass()
+    player.async_write_ha_state.reset_mock()
+    yield player
+    await player.async_will_remove_from_hass()
+
+
+async def test_position_only_change_not_written(
+    coordinator: MediaServerUpdateCoordinator,
+    media_server: MediaServer,
+    player: JRiverMediaPlayer,
+) -> None:
+    """Test state is not written when the position moves as expected."""
+    media_server.values["PositionMS"] = "1500"
+    await coordinator.async_refresh()
+
+    # the player saw the new position but it is where it was expected to be
+    assert player._playback_info.position_ms == 1500
+    player.async_write_ha_state.assert_not_called()
+    assert player.media_position == 1
+
+
+async def test_changes_written(
+    coordinator: MediaServerUpdateCoordinator,
+    media_server: MediaServer,
+    player: JRiverMediaPlayer,
+) -> None:
+    """Test state is written when an attribute changes or the position jumps."""
+    media_server.values["Volume"] = "0.4"
+    await coordinator.async_refresh()
+    assert player.async_write_ha_state.call_count == 1
+    assert player.volume_level == 0.4
+
+    media_server.values["PositionMS"] = "60000"
+    await coordinator.async_refresh()
+    assert player.async_write_ha_state.call_count == 2
+    assert player.media_position == 60
+
+
+async def test_optimistic_volume_confirmed(
+    coordinator: MediaServerUpdateCoordinator,
+    media_server: MediaServer,
+    player: JRiverMediaPlayer,
+) -> None:
+    """Test the volume is shown straight away and kept once the server reports it."""
+    await player.async_set_volume_level(0.5)
+    assert player.volume_level == 0.5
+    player.async_write_ha_state.assert_called_once()
+
+    media_server.values["Volume"] = "0.5"
+    await coordinator.async_refresh()
+
+    assert player.volume_level == 0.5
+    assert not player._optimistic
+
+
+async def test_optimistic_volume_ignored_by_server(
+    coordinator: MediaServerUpdateCoordinator,
+    media_server: MediaServer,
+    player: JRiverMediaPlayer,
+) -> None:
+    """Test the real volume is shown again when the server ignores the command."""
+    await player.async_set_volume_level(0.5)
+    assert player.volume_level == 0.5
+
+    await coordinator.async_refresh()
+
+    assert player.volume_level == 0.3
+    assert not player._optimistic
+    assert player.async_write_ha_state.call_count == 2
+
+
+async def test_optimistic_state_kept_until_newer_poll(
+    hass: HomeAssistant,
+    coordinator: MediaServerUpdateCoordinator,
+    media_server: MediaServer,
+    player: JRiverMediaPlayer,
+) -> None:
+    """Test a poll which started before the command completed does not clear it."""
+    get_playback_info = media_server.get_playback_info.side_effect
+    poll_started = asyncio.Event()
+    command_sent = asyncio.Event()
+
+    async def _poll_during_command(*args, **kwargs) -> PlaybackInfo:
+        poll_started.set()
+        await command_sent.wait()
+        return await get_playback_info(*args, **kwargs)
+
+    media_server.get_playback_info.side_effect = _poll_during_command
+    refresh = hass.async_create_task(coordinator.async_refresh())
+    await poll_started.wait()
+    await player.async_media_pause()
+    command_sent.set()
+    await refresh
+    assert player.state == MediaPlayerState.PAUSED
+
+    media_server.get_playback_info.side_effect = get_playback_info
+    await coordinator.async_refresh()
+    assert player.state == MediaPlayerState.PLAYING
+
+
+@pytest.mark.parametrize(
+    "error", [CannotConnectError(), MediaServerError(), TimeoutError()]
+)
+async def test_optimistic_volume_rolled_back(
+    media_server: MediaServer, player: JRiverMediaPlayer, error: Exception
+) -> None:
+    """Test the volume is rolled back when the command fails."""
+    media_server.set_volume_level.side_effect = error
+
+    if isinstance(error, CannotConnectError):
+        await player.async_set_volume_level(0.5)
+    else:
+        with pytest.raises(type(error)):
+            await player.async_set_volume_level(0.5)
+
+    assert player.volume_level == 0.3
+    assert not player._optimistic
+    assert player.async_write_ha_state.call_count == 2
@@ -0,0 +1,82 @@
+"""Test the JRiver Media Center poll scheduler."""
+import asyncio
+import datetime as dt
+from unittest.mock import AsyncMock, Mock, patch
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.jriver.const import POLL_INTERVAL_ACTIVE
+from custom_components.jriver.coordinator import MediaServerUpdateCoordinator
+from custom_components.jriver.scheduler import PollScheduler
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+
+def _coordinator(name: str, poll_interval: float) -> MediaServerUpdateCoordinator:
+    coordinator = Mock(MediaServerUpdateCoordinator)
+    coordinator.name = name
+    coordinator.config_entry = None
+    coordinator.poll_interval = dt.timedelta(seconds=poll_interval)
+    coordinator.async_refresh = AsyncMock()
+    return coordinator
+
+
+class _Clock:
+    """Advances the event loop clock and the wall clock together."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._loop_time = hass.loop.time()
+        self._now = dt_util.utcnow()
+
+    def time(self) -> float:
+        return self._loop_time
+
+    async def tick(self, seconds: float) -> None:
+        self._loop_time += seconds
+        self._now += dt.timedelta(seconds=seconds)
+        async_fire_time_changed(self._hass, self._now)
+        await self._hass.async_block_till_done()
+
+
+async def test_polls_take_turns(hass: HomeAssistant) -> None:
+    """Test each coordinator is polled in its own slot once its interval elapses."""
+    clock = _Clock(hass)
+    with patch.object(hass.loop, "time", clock.time):
+        scheduler = PollScheduler(hass)
+        fast = _coordinator("fast", POLL_INTERVAL_ACTIVE)
+        slow = _coordinator("slow", POLL_INTERVAL_ACTIVE * 3)
+        unregister_fast = scheduler.async_register(fast)
+        unregister_slow = scheduler.async_register(slow)
+
+        slot = POLL_INTERVAL_ACTIVE / 2
+        for _ in range(6):
+            await clock.tick(slot)
+
+        assert fast.async_refresh.await_count == 3
+        assert slow.async_refresh.await_count == 1
+
+        unregister_fast()
+        unregister_slow()
+
+
+async def test_overrunning_poll_skipped(hass: HomeAssistant) -> None:
+    """Test a coordinator is not polled again while its last poll is running."""
+    clock = _Clock(hass)
+    with patch.object(hass.loop, "time", clock.time):
+        scheduler = PollScheduler(hass)
+        coordinator = _coordinator("slow", POLL_INTERVAL_ACTIVE)
+        poll_done = asyncio.Event()
+        coordinator.async_refresh.side_effect = poll_done.wait
+        unregister = scheduler.async_register(coordinator)
+
+        for _ in range(3):
+            await clock.tick(POLL_INTERVAL_ACTIVE)
+        assert coordinator.async_refresh.call_count == 1
+
+        poll_done.set()
+        await hass.async_block_till_done()
+        await clock.tick(POLL_INTERVAL_ACTIVE)
+        assert coordinator.async_refresh.call_count == 2
+
+        unregister()
@@ -0,0 +1,80 @@
+"""Test the JRiver Media Center single flight MediaServer."""
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from hamcws import MediaServerConnection
+import pytest
+
+from custom_components.jriver.server import SingleFlightMediaServer
+
+
+@pytest.fixture
+def connection() -> MediaServerConnection:
+    """Mock a connection whose requests wait until released."""
+    conn = Mock(MediaServerConnection)
+    conn.released = asyncio.Event()
+
+    async def _get_as_dict(path: str, params: dict | None = None) -> tuple[bool, dict]:
+        await conn.released.wait()
+        return True, {"path": path, **(params or {})}
+
+    conn.get_as_dict = AsyncMock(side_effect=_get_as_dict)
+    return conn
+
+
+async def test_identical_requests_shared(connection: MediaServerConnection) -> None:
+    """Test concurrent identical reads share a single request."""
+    ms = SingleFlightMediaServer(connection)
+
+    first = asyncio.create_task(ms.browse_children(1))
+    second = asyncio.create_task(ms.browse_children(1))
+    other = asyncio.create_task(ms.browse_children(2))
+    await asyncio.sleep(0)
+    connection.released.set()
+
+    assert await first == await second
+    assert (await other)["ID"] == 2
+    assert connection.get_as_dict.await_count == 2
+    assert not ms._in_flight
+
+    await ms.browse_children(1)
+    assert connection.get_as_dict.await_count == 3
+
+
+async def test_commands_always_sent(connection: MediaServerConnection) -> None:
+    """Test commands are never shared."""
+    ms = SingleFlightMediaServer(connection)
+
+    commands = [asyncio.create_task(ms.play_pause()) for _ in range(2)]
+    await asyncio.sleep(0)
+    connection.released.set()
+    await asyncio.gather(*commands)
+
+    assert connection.get_as_dict.await_count == 2
+
+
+async def test_request_cancelled_with_last_waiter(
+    connection: MediaServerConnection,
+) -> None:
+    """Test the request is only cancelled once every caller has given up."""
+    ms = SingleFlightMediaServer(connection)
+
+    first = asyncio.create_task(ms.browse_children(1))
+    second = asyncio.create_task(ms.browse_children(1))
+    await asyncio.sleep(0)
+    (flight,) = ms._in_flight.values()
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert not flight.task.done()
+
+    second.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await second
+    await asyncio.sleep(0)
+    assert flight.task.cancelled()
+    assert not ms._in_flight
+
+    connection.released.set()
+    assert (await ms.browse_children(1))["ID"] == 1